@@ -131,13 +131,32 @@ class Settings:
     
     TIMEOUT = 30000      # Timeout para operações (30 segundos)
     DELAY = 0.5          # Delay entre operações (0.5 segundos)
-    SHUTDOWN_DELAY = 3   # Delay para desligamento (3 segundos)
     
     # =========================================================================
     # CONFIGURAÇÕES DO NAVEGADOR (BROWSER)
     # =========================================================================
     
-    HEADLESS = False  # Executar navegador em modo visível para debug
+    # Navegador sem janela por padrão; HEADLESS=false no .env abre o Edge visível para debug
+    HEADLESS = os.getenv("HEADLESS", "true").strip().lower() not in ("false", "0", "nao", "não")
+    
+    # Argumentos de inicialização do Edge: sem GPU, extensões ou imagens (a automação não usa)
+    BROWSER_ARGS = [
+        "--disable-gpu",
+        "--disable-extensions",
+        "--blink-settings=imagesEnabled=false",
+    ]
+    
+    # Endpoint CDP de um Edge já aberto com --remote-debugging-port (ex.: http://localhost:9222).
+    # Vazio: cada execução abre e fecha o próprio navegador
+    CDP_ENDPOINT = os.getenv("CDP_ENDPOINT", "")
+    
+    # Perfil do Edge mantido entre execuções (cache de JS e HTTP já aquecido).
+    # EDGE_PROFILE_DIR vazio no .env volta a usar um perfil temporário a cada execução
+    EDGE_PROFILE_DIR = os.getenv("EDGE_PROFILE_DIR", str(DATA_DIR / "edge_profile"))
+    
+    # Preenche os campos de parâmetros com um único script no navegador em vez do fill() do Playwright.
+    # Desligado por padrão até ser validado no Protheus: o SmartClient pode ignorar o valor gravado via script
+    PREENCHIMENTO_VIA_SCRIPT = os.getenv("PREENCHIMENTO_VIA_SCRIPT", "false").strip().lower() in ("true", "1", "sim")
     
     # =========================================================================
     # CONFIGURAÇÕES DE EMAIL
@@ -34,7 +34,6 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
-import time
 
 import traceback
 import sys
@@ -458,9 +457,8 @@ def main():
     # Limpar pasta de dados antes de começar
     # quantidade = excluir_arquivos_pasta(settings.CAMINHO_PLS)
     # logger.info(f"Preparando ambiente: {quantidade} arquivos antigos removidos")
-    # Configurar settings personalizadas
+    # Configurar settings (HEADLESS vem do .env; o padrão é executar sem janela)
     custom_settings = Settings()
-    custom_settings.HEADLESS = False  # Executar com interface gráfica
     
     try:
         # Executar o scraper do Protheus
@@ -0,0 +1,56 @@
+"""
+Registro dos locators comuns às telas do Protheus.
+Os botões e menus compartilhados entre os relatórios são criados uma única vez
+por página e reaproveitados por todas as classes de extração.
+"""
+
+from weakref import WeakKeyDictionary
+import re
+
+# Menus do Protheus exibem a quantidade de itens no nome, ex.: "Relatorios (9)".
+# Os padrões aceitam qualquer quantidade, para não quebrar quando o menu muda.
+MENU_RELATORIOS_RE = re.compile(r"^Relatorios\s*\(\d+\)$")
+MENU_FINANCEIRO_RE = re.compile(r"^Financeiro\s*\(\d+\)$")
+MENU_BALANCETES_RE = re.compile(r"^Balancetes\s*\(\d+\)$")
+
+# Locators base já criados, por página (liberados junto com a página)
+_BASE_POR_PAGINA = WeakKeyDictionary()
+
+
+def _criar_base(page):
+    """
+    Cria os locators compartilhados por todas as telas de relatório.
+
+    Args:
+        page: Instância da página do Playwright
+
+    Returns:
+        dict: Locators base indexados pelo nome
+    """
+    return {
+        'menu_relatorios': page.get_by_text(MENU_RELATORIOS_RE),
+        'popup_fechar': page.get_by_role("button", name="Fechar"),
+        'botao_confirmar': page.get_by_role("button", name="Confirmar"),
+        'botao_marcar_filiais': page.get_by_role("button", name="Marca Todos - <F4>"),
+        'botao_sim': page.get_by_role("button", name="Sim"),
+    }
+
+
+def build(page):
+    """
+    Retorna os locators base da página, criando-os apenas no primeiro acesso.
+
+    Locators do Playwright são imutáveis, por isso o mesmo objeto pode ser
+    compartilhado entre as classes; cada chamada devolve um dicionário novo
+    para que cada classe acrescente seus próprios locators.
+
+    Args:
+        page: Instância da página do Playwright
+
+    Returns:
+        dict: Cópia do dicionário de locators base
+    """
+    base = _BASE_POR_PAGINA.get(page)
+    if base is None:
+        base = _BASE_POR_PAGINA[page] = _criar_base(page)
+    return dict(base)
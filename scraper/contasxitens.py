@@ -15,9 +15,9 @@ from .exceptions import (
     ExcecaoNaoMapeadaError
 )
 from .utils import Utils
+from ._locator_registry import build as build_locators, MENU_BALANCETES_RE
 from datetime import date
 from pathlib import Path
-import calendar
 import time
 
 # Configuração do logger para registro de atividades
@@ -26,29 +26,28 @@ logger = configure_logger()
 class Contas_x_itens(Utils):
     """Classe para automação do relatório Contas X Itens."""
     
-    def __init__(self, page):  
+    def __init__(self, page, settings=None):  
         """
         Inicializa a classe Contas X Itens.
         
         Args:
             page: Instância da página do Playwright
+            settings: Configurações já carregadas pelo orquestrador (opcional)
         """
         self.page = page
         self._definir_locators()
-        self.settings = Settings() 
+        self.settings = settings or Settings() 
         self.parametros_json = 'Contas_X_Itens'
         logger.info("Contas_x_itens inicializado")
 
     def _definir_locators(self):
         """Define todos os locators específicos do relatório Contas X Itens."""
-        self.locators = {
+        # Menus e botões comuns vêm do registro compartilhado
+        self.locators = build_locators(self.page)
+        self.locators.update({
             # Elementos do menu de navegação
-            'menu_relatorios': self.page.get_by_text("Relatorios (9)"),
-            'submenu_balancetes': self.page.get_by_text("Balancetes (34)"),
+            'submenu_balancetes': self.page.get_by_text(MENU_BALANCETES_RE),
             'opcao_contas_x_itens': self.page.get_by_text("Contas X Itens", exact=True),
-            'popup_fechar': self.page.get_by_role("button", name="Fechar"),
-            'botao_confirmar': self.page.get_by_role("button", name="Confirmar"),
-            'botao_marcar_filiais': self.page.get_by_role("button", name="Marca Todos - <F4>"),
 
             # Campos de parâmetros do relatório
             'data_inicial': self.page.locator("#COMP4512").get_by_role("textbox"),
@@ -79,8 +78,7 @@ class Contas_x_itens(Utils):
             'aba_planilha': self.page.get_by_role("button", name="Planilha"),
             'formato': self.page.locator("#COMP4547").get_by_role("combobox"),
             'botao_imprimir': self.page.get_by_role("button", name="Imprimir"),
-            'botao_sim': self.page.get_by_role("button", name="Sim")
-        }
+        })
         logger.info("Seletores definidos")
 
     def _navegar_menu(self):
@@ -97,22 +95,14 @@ class Contas_x_itens(Utils):
             self.locators['menu_relatorios'].wait_for(state="visible", timeout=10000)
             self.locators['menu_relatorios'].click()
             
-            time.sleep(5)  
-            
-            # Verifica se o submenu está visível, caso contrário clica novamente
-            if not self.locators['submenu_balancetes'].is_visible():
-                self.locators['menu_relatorios'].click()
-                time.sleep(1)
+            # Aguarda o submenu; se o menu não abriu, clica novamente
+            self._aguardar_ou_repetir('submenu_balancetes', 'menu_relatorios', timeout=5000)
             
             self.locators['submenu_balancetes'].click()
             logger.info("Submenu Balancetes clicado")
-            time.sleep(1)
             
-            if not self.locators['opcao_contas_x_itens'].is_visible():
-                self.locators['submenu_balancetes'].click()
-                time.sleep(1)
-            # Seleciona a opção Contas X Itens
-            self.locators['opcao_contas_x_itens'].wait_for(state="visible")
+            # Seleciona a opção Contas X Itens (repetindo o clique no submenu se ele não abriu)
+            self._aguardar_ou_repetir('opcao_contas_x_itens', 'submenu_balancetes')
             self.locators['opcao_contas_x_itens'].click()
             logger.info("Contas x Itens selecionada")
             
@@ -286,27 +276,20 @@ class Contas_x_itens(Utils):
                 self._fechar_popup_se_existir()
                 
             
-            download = download_info.value
-            logger.info(f"Download iniciado: {download.suggested_filename}") 
-            
-            # Aguardar conclusão do download
-            download_path = download.path()
-            if download_path:
-                settings = Settings()
-                if conta == "10106020001":
-                    # destino = Path(settings.CAMINHO_PLS) / "ctbr100.xml"
-                    destino = Path(settings.CAMINHO_PLS) / "ctbr100.xlsx"
-                else:
-                    # destino = Path(settings.CAMINHO_PLS) / "ctbr140.xml"
-                    destino = Path(settings.CAMINHO_PLS) / "ctbr140.xlsx"
-                                
-                
-                destino.parent.mkdir(parents=True, exist_ok=True)
-                
-                download.save_as(destino)
+            if conta == "10106020001":
+                # destino = Path(self.settings.CAMINHO_PLS) / "ctbr100.xml"
+                destino = Path(self.settings.CAMINHO_PLS) / "ctbr100.xlsx"
+            else:
+                # destino = Path(self.settings.CAMINHO_PLS) / "ctbr140.xml"
+                destino = Path(self.settings.CAMINHO_PLS) / "ctbr140.xlsx"
+            destino.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Aguardar conclusão do download e salvar
+            falha = self._salvar_download(download_info.value, destino)
+            if falha is None:
                 logger.info(f"Arquivo Contas x itens salvo em: {destino}")
             else:
-                logger.error("Download falhou - caminho não disponível")
+                logger.error(f"Download falhou - {falha}")
             
             
         except TimeoutError as e:
@@ -332,11 +315,8 @@ class Contas_x_itens(Utils):
             logger.info(f'Processando conta: {conta}')
             
             self._navegar_menu()
-            time.sleep(1) 
+            # Cada etapa aguarda o próprio elemento, sem pausas fixas entre elas
             self._confirmar_operacao()  
-            time.sleep(1) 
-            self._fechar_popup_se_existir()  
-            time.sleep(1) 
             self._fechar_popup_se_existir()  
             self._preencher_parametros(conta)  
             self._selecionar_filiais()  
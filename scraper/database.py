@@ -5,6 +5,7 @@ para realizar a conciliação entre sistemas financeiros e contábeis.
 """
 
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from config.settings import Settings
 from config.logger import configure_logger
@@ -14,7 +15,7 @@ from .exceptions import (
     ResultsSaveError,
     ExcecaoNaoMapeadaError
 )
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle
 from openpyxl.utils import get_column_letter
 from difflib import get_close_matches
 from workalendar.america import Brazil
@@ -27,9 +28,279 @@ import numpy as np
 import openpyxl
 import re
 
+# Leitor de XLSX em Rust (python-calamine); sem ele o pandas usa o openpyxl
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = None
+
 # Configura o logger para registrar eventos
 logger = configure_logger()
 locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
+
+# ==============================================
+# ESTILOS DAS PLANILHAS EXPORTADAS
+# ==============================================
+# Instâncias únicas reaproveitadas em todas as abas (cores em ARGB)
+HEADER_FILL = PatternFill(start_color="FF4F81BD", end_color="FF4F81BD", fill_type="solid")
+GREEN_FILL = PatternFill(start_color="FFC6EFCE", end_color="FFC6EFCE", fill_type="solid")
+RED_FILL = PatternFill(start_color="FFFFC7CE", end_color="FFFFC7CE", fill_type="solid")
+YELLOW_FILL = PatternFill(start_color="FFFFEB9C", end_color="FFFFEB9C", fill_type="solid")
+GRAY_FILL = PatternFill(start_color="FFD9D9D9", end_color="FFD9D9D9", fill_type="solid")
+HEADER_FONT = Font(color="FFFFFFFF", bold=True)
+RED_FONT = Font(color="FF9C0006", bold=True)
+ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
+THIN_BORDER = Border(
+    left=Side(style='thin'), 
+    right=Side(style='thin'), 
+    top=Side(style='thin'), 
+    bottom=Side(style='thin')
+)
+MONEY_FORMAT = 'R$ #,##0.00;[Red]R$ -#,##0.00'
+
+# Índice de estilo por status e nomes dos estilos de linha/destaque correspondentes
+STATUS_STYLE_IDX = {'Conferido': 1, 'Divergente': 2, 'Pendente': 3}
+ROW_STYLES = ('corpo', 'corpo_verde', 'corpo_vermelho', 'corpo_amarelo')
+DIFF_STYLES = ('destaque_amarelo', 'destaque_verde', 'destaque_vermelho', 'destaque_amarelo')
+
+# Colunas com formatação monetária nas abas de dados
+MONETARY_HEADERS = frozenset({
+    'Valor Financeiro', 'Valor Contábil', 'Diferença',
+    'Valor em Aberto', 'Valor Provisionado', 'Saldo Atual',
+    'Débito', 'Crédito', 'Valor Original', 'Saldo Devedor',
+    'Quantidade', 'Valor Unitário', 'Valor Total', 'Saldo Anterior'
+})
+
+# Colunas com formatação monetária nas abas de resumo
+RESUMO_MONETARY_HEADERS = frozenset({
+    'Valor Financeiro', 'Valor Contábil', 'Diferença',
+    'Valor em Aberto', 'Valor Provisionado', 'Saldo Atual',
+    'Débito', 'Crédito'
+})
+
+# Separação de "código - descrição" do fornecedor (compiladas uma única vez)
+_CODIGO_DESCRICAO_RE = re.compile(r'^(?P<codigo>\d+[\s\-\.\/]*\d*)(?P<descricao>.*)$', re.DOTALL)
+_NAO_DIGITO_RE = re.compile(r'[^\d]')
+_SEPARADOR_INICIAL_RE = re.compile(r'^[\s\-\.\/]+')
+
+
+def _extrair_codigo(valor):
+    """Função SQL: código numérico do início de um texto 'código - descrição'."""
+    if valor is None:
+        return ""
+    match = _CODIGO_DESCRICAO_RE.match(str(valor).strip())
+    return _NAO_DIGITO_RE.sub("", match.group("codigo")) if match else ""
+
+
+def _extrair_descricao(valor):
+    """Função SQL: descrição de um texto 'código - descrição', sem o código inicial."""
+    if valor is None:
+        return ""
+    valor_str = str(valor).strip()
+    match = _CODIGO_DESCRICAO_RE.match(valor_str)
+    return _SEPARADOR_INICIAL_RE.sub("", match.group("descricao")) if match else valor_str
+
+# Tipos de título desconsiderados no total financeiro da validação de consistência
+_TIPOS_TITULO_NAO_FORNECEDOR = ('NDF', 'PA', 'BOL', 'EMP', 'TX', 'INS', 'ISS', 'TXA', 'IRF')
+
+# ==============================================
+# METADADOS DAS PLANILHAS EXPORTADAS
+# ==============================================
+LEGENDA_STATUS = (
+    'CONFERIDO: Diferença dentro da tolerância (até 3%) | '
+    'DIVERGENTE: Diferença significativa | PENDENTE: Sem correspondência'
+)
+TOLERANCIA_DIFERENCA = 'Até 3% de discrepância é considerada tolerável'
+
+# Cada linha é o par (item, função que recebe o contexto da exportação e devolve o valor);
+# por serem pares, item e valor não têm como ficar desalinhados.
+# O contexto traz 'stats', 'adiantamento' (estatísticas), 'gerado_em' e 'periodo' (textos já formatados).
+_META_PROCESSAMENTO = (
+    ('Data e Hora do Processamento', lambda c: c['gerado_em']),
+    ('Período de Referência', lambda c: c['periodo']),
+)
+
+_META_FORNECEDORES = (
+    ('Total de Fornecedores Processados', lambda c: int(c['stats']['total_registros'])),
+    ('Conciliações Conferidas', lambda c: int(c['stats']['conciliados_ok'])),
+    ('Conciliações Divergentes', lambda c: int(c['stats']['divergentes'])),
+    ('Conciliações Pendentes', lambda c: int(c['stats']['pendentes'])),
+    ('Total Financeiro (R$)', lambda c: f"R$ {c['stats']['total_financeiro']:,.2f}"),
+    ('Total Contábil (R$)', lambda c: f"R$ {c['stats']['total_contabil']:,.2f}"),
+    ('Diferença Total (R$)', lambda c: f"R$ {c['stats']['diferenca_geral']:,.2f}"),
+)
+
+_META_CONFIGURACOES = (
+    ('--- CONFIGURAÇÕES ---', lambda c: '---'),
+    ('Legenda de Status', lambda c: LEGENDA_STATUS),
+    ('Tolerância de Diferença', lambda c: TOLERANCIA_DIFERENCA),
+)
+
+METADATA_SCHEMA = {
+    'fornecedores': _META_PROCESSAMENTO + _META_FORNECEDORES + _META_CONFIGURACOES,
+    'adiantamentos': _META_PROCESSAMENTO + (
+        ('Total de Adiantamentos Processados', lambda c: int(c['adiantamento']['total_adiantamentos'])),
+        ('Adiantamentos Conferidos', lambda c: int(c['adiantamento']['adiantamentos_ok'])),
+        ('Adiantamentos Divergentes', lambda c: int(c['adiantamento']['adiantamentos_divergentes'])),
+        ('Adiantamentos Pendentes', lambda c: int(c['adiantamento']['adiantamentos_pendentes'])),
+        ('Total Financeiro Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['total_financeiro_adiantamento']:,.2f}"),
+        ('Total Contábil Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['total_contabil_adiantamento']:,.2f}"),
+        ('Diferença Total Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['diferenca_adiantamento']:,.2f}"),
+    ) + _META_CONFIGURACOES,
+    'all': _META_PROCESSAMENTO + _META_FORNECEDORES + (
+        ('--- ADIANTAMENTOS ---', lambda c: '---'),
+        ('Total de Adiantamentos Processados', lambda c: int(c['adiantamento']['total_adiantamentos'])),
+        ('Adiantamentos Divergentes', lambda c: int(c['adiantamento']['adiantamentos_divergentes'])),
+        ('Total Financeiro Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['total_financeiro_adiantamento']:,.2f}"),
+        ('Total Contábil Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['total_contabil_adiantamento']:,.2f}"),
+        ('Saldo Líquido Adiantamentos (R$)', lambda c: f"R$ {c['adiantamento']['diferenca_adiantamento']:,.2f}"),
+    ) + _META_CONFIGURACOES,
+}
+
+# ==============================================
+# CONSULTAS DO PROCESSAMENTO DA CONCILIAÇÃO
+# ==============================================
+# Modelos com os nomes das tabelas como placeholders; são formatados
+# uma única vez por instância em _preparar_queries.
+
+_SQL_CONSOLIDADA = """
+INSERT INTO {resultado}
+(codigo_fornecedor, descricao_fornecedor, saldo_financeiro, saldo_contabil, status)
+
+-- Busca fornecedores do financeiro (NF/FT)
+SELECT 
+    COALESCE(NULLIF(TRIM(f.codigo_fornecedor), ''), TRIM(f.fornecedor)) as codigo_fornecedor,
+    COALESCE(NULLIF(TRIM(f.descricao_fornecedor), ''), TRIM(f.fornecedor)) as descricao_fornecedor,
+    SUM(COALESCE(f.valor_original, 0)) as saldo_financeiro,
+    0 as saldo_contabil,  -- Será atualizado depois
+    'Pendente' as status
+FROM 
+    {financeiro} f
+WHERE 
+    f.excluido = 0
+    AND UPPER(f.tipo_titulo) IN ('NF','FT')
+GROUP BY 
+    COALESCE(NULLIF(TRIM(f.codigo_fornecedor), ''), TRIM(f.fornecedor)),
+    COALESCE(NULLIF(TRIM(f.descricao_fornecedor), ''), TRIM(f.fornecedor))
+"""
+
+_SQL_ATUALIZA_CONTABIL = """
+UPDATE {resultado}
+SET 
+    saldo_contabil = (
+        SELECT COALESCE(SUM(ci.saldo_atual), 0)
+        FROM {contas_itens} ci
+        WHERE 
+            ci.conta_contabil LIKE '2.01.02.01.0001%'
+            AND REPLACE(REPLACE(UPPER(TRIM(ci.codigo_fornecedor)), 'AF', ''), 'F', '') =
+                REPLACE(REPLACE(UPPER(TRIM({resultado}.codigo_fornecedor)), 'AF', ''), 'F', '')
+            AND ci.codigo_fornecedor IS NOT NULL
+            AND ci.codigo_fornecedor != ''
+    ),
+    detalhes = (
+        SELECT GROUP_CONCAT(
+            'Conta: ' || ci.conta_contabil || 
+            ' | Item: ' || ci.descricao_item || 
+            ' | Valor: R$ ' || ROUND(COALESCE(ci.saldo_atual, 0), 2), ' | '
+        )
+        FROM {contas_itens} ci
+        WHERE 
+            ci.conta_contabil LIKE '2.01.02.01.0001%'
+            AND REPLACE(REPLACE(UPPER(TRIM(ci.codigo_fornecedor)), 'AF', ''), 'F', '') =
+                REPLACE(REPLACE(UPPER(TRIM({resultado}.codigo_fornecedor)), 'AF', ''), 'F', '')
+            AND ci.codigo_fornecedor IS NOT NULL
+            AND ci.codigo_fornecedor != ''
+    )
+WHERE EXISTS (
+    SELECT 1
+    FROM {contas_itens} ci2
+    WHERE 
+        ci2.conta_contabil LIKE '2.01.02.01.0001%'
+        AND REPLACE(REPLACE(UPPER(TRIM(ci2.codigo_fornecedor)), 'AF', ''), 'F', '') =
+            REPLACE(REPLACE(UPPER(TRIM({resultado}.codigo_fornecedor)), 'AF', ''), 'F', '')
+        AND ci2.codigo_fornecedor IS NOT NULL
+        AND ci2.codigo_fornecedor != ''
+)
+"""
+
+_SQL_ADIANTAMENTO = """
+UPDATE {resultado}
+SET 
+    saldo_contabil = saldo_contabil + (
+        SELECT COALESCE(SUM(saldo_atual), 0)
+        FROM {adiantamento} a
+        WHERE 
+            --  FILTRO DA CONTA DE ADIANTAMENTO
+            a.conta_contabil LIKE '1.01.06.02.0001%'
+            AND a.codigo_fornecedor = {resultado}.codigo_fornecedor
+    )
+WHERE EXISTS (
+    SELECT 1
+    FROM {adiantamento} a2
+    WHERE 
+        a2.conta_contabil LIKE '1.01.06.02.0001%'
+        AND a2.codigo_fornecedor = {resultado}.codigo_fornecedor
+)
+"""
+
+_SQL_CONTABEIS_FALTANTES = """
+INSERT INTO {resultado}
+(codigo_fornecedor, descricao_fornecedor, saldo_financeiro, saldo_contabil, status)
+
+SELECT 
+    COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor) as codigo_fornecedor,
+    COALESCE(NULLIF(TRIM(ci.descricao_fornecedor), ''), ci.descricao_item) as descricao_fornecedor,
+    0 as saldo_financeiro,
+    SUM(COALESCE(ci.saldo_atual, 0)) as saldo_contabil,
+    'Pendente' as status
+FROM 
+    {contas_itens} ci
+WHERE 
+    ci.conta_contabil LIKE '2.01.02.01.0001%'
+    AND NOT EXISTS (
+        SELECT 1
+        FROM {resultado} r
+        WHERE r.codigo_fornecedor = COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor)
+    )
+GROUP BY 
+    COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor),
+    COALESCE(NULLIF(TRIM(ci.descricao_fornecedor), ''), ci.descricao_item)
+"""
+
+_SQL_DIFERENCA = """
+UPDATE {resultado}
+SET 
+    diferenca = ROUND(COALESCE(saldo_contabil, 0) - COALESCE(saldo_financeiro, 0), 2),
+    status = CASE 
+        WHEN saldo_contabil IS NULL AND saldo_financeiro IS NULL THEN 'Pendente'
+        WHEN ABS(COALESCE(saldo_financeiro, 0) - COALESCE(saldo_contabil, 0)) <= 
+            (0.03 * CASE 
+                WHEN ABS(COALESCE(saldo_contabil, 0)) > ABS(COALESCE(saldo_financeiro, 0)) 
+                THEN ABS(COALESCE(saldo_contabil, 0)) 
+                ELSE ABS(COALESCE(saldo_financeiro, 0)) 
+            END)
+            THEN 'Conferido' 
+        ELSE 'Divergente' 
+    END
+"""
+
+_SQL_INVESTIGACAO = """
+UPDATE {resultado}
+SET detalhes = COALESCE(detalhes, '') || 
+    ' | Divergência: R$ ' || ABS(diferenca) || 
+    '. Itens Contábeis encontrados: ' || 
+    COALESCE(
+        (SELECT COUNT(*) || ' itens'
+        FROM {contas_itens} ci
+        WHERE (ci.codigo_fornecedor = {resultado}.codigo_fornecedor 
+                OR ci.descricao_fornecedor = {resultado}.descricao_fornecedor)
+        AND ci.conta_contabil LIKE '2.01.02.01.0001%'),
+        'Nenhum item específico encontrado'
+    )
+WHERE status = 'Divergente'
+"""
+
 class DatabaseManager:
     """
     Gerenciador de banco de dados para conciliação contábil.
@@ -63,9 +334,32 @@ class DatabaseManager:
         self.settings = Settings()  # Carrega configurações
         self.conn = None  # Conexão com o banco
         self.logger = configure_logger()  # Logger específico da classe
+        self._queries = self._preparar_queries()  # Consultas já formatadas
         self._initialize_database()  # Inicializa o banco de dados
         self._initialized = True  # Marca como inicializado
 
+    def _preparar_queries(self):
+        """
+        Formata as consultas do processamento com os nomes das tabelas configurados.
+        
+        Returns:
+            dict: Consultas prontas para execução, indexadas pelo nome da etapa
+        """
+        tabelas = {
+            'resultado': self.settings.TABLE_RESULTADO,
+            'financeiro': self.settings.TABLE_FINANCEIRO,
+            'contas_itens': self.settings.TABLE_CONTAS_ITENS,
+            'adiantamento': self.settings.TABLE_ADIANTAMENTO,
+        }
+        return {
+            'consolidada': _SQL_CONSOLIDADA.format(**tabelas),
+            'atualiza_contabil': _SQL_ATUALIZA_CONTABIL.format(**tabelas),
+            'adiantamento': _SQL_ADIANTAMENTO.format(**tabelas),
+            'contabeis_faltantes': _SQL_CONTABEIS_FALTANTES.format(**tabelas),
+            'diferenca': _SQL_DIFERENCA.format(**tabelas),
+            'investigacao': _SQL_INVESTIGACAO.format(**tabelas),
+        }
+
     def _initialize_database(self):
         """
         Inicializa o banco de dados SQLite e cria as tabelas necessárias.
@@ -76,6 +370,17 @@ class DatabaseManager:
         try:
             # Conecta ao banco SQLite
             self.conn = sqlite3.connect(self.settings.DB_PATH, timeout=10)
+            self.conn.set_trace_callback(None)  # Garante que não há rastreamento de SQL ativo
+            
+            # Ajustes de desempenho para as cargas e atualizações em lote
+            self.conn.execute("PRAGMA journal_mode=WAL")  # Leitores não bloqueiam a escrita
+            self.conn.execute("PRAGMA synchronous=NORMAL")  # Um fsync por checkpoint, não por commit
+            self.conn.execute("PRAGMA temp_store=MEMORY")  # Tabelas temporárias e ordenações em memória
+            self.conn.execute("PRAGMA cache_size=-131072")  # Cache de páginas de 128 MB
+            self.conn.execute("PRAGMA mmap_size=268435456")  # Leitura mapeada em memória de até 256 MB
+            
+            # Separação de código e descrição disponível diretamente nas consultas
+            self._registrar_funcoes(self.conn)
             cursor = self.conn.cursor()
             
             # Cria tabela financeiro se não existir
@@ -201,6 +506,9 @@ class DatabaseManager:
             ensure_column(self.settings.TABLE_MODELO1, 'descricao_fornecedor', 'TEXT')
             ensure_column(self.settings.TABLE_RESULTADO, 'ordem_importancia', 'INTEGER')
             
+            # Índices das chaves usadas nas consultas de conciliação
+            self._criar_indices(cursor)
+            
             self.conn.commit()  # Confirma as alterações
             logger.info("Banco de dados inicializado com sucesso")
             
@@ -209,6 +517,113 @@ class DatabaseManager:
             logger.error(error_msg)
             raise ExcecaoNaoMapeadaError(error_msg) from e
 
+    def _registrar_funcoes(self, conn):
+        """
+        Registra na conexão as funções SQL usadas pelas consultas de exportação.
+        
+        Args:
+            conn: Conexão SQLite que receberá as funções
+        """
+        conn.create_function("extrair_codigo", 1, _extrair_codigo, deterministic=True)
+        conn.create_function("extrair_descricao", 1, _extrair_descricao, deterministic=True)
+
+    def _abrir_conexao_leitura(self):
+        """
+        Abre uma conexão somente leitura ao banco, usada pelas leituras paralelas.
+        
+        Returns:
+            sqlite3.Connection: Conexão em modo read-only com as funções registradas
+        """
+        conn = sqlite3.connect(f"{Path(self.settings.DB_PATH).as_uri()}?mode=ro", uri=True, timeout=10)
+        self._registrar_funcoes(conn)
+        return conn
+
+    def _ler_consulta(self, query, dtype=None):
+        """
+        Executa uma consulta em conexão própria e retorna o DataFrame resultante.
+        
+        Args:
+            query: Consulta SQL a ser lida
+            dtype: Tipos explícitos por coluna (opcional)
+            
+        Returns:
+            pd.DataFrame: Resultado da consulta
+        """
+        conn = self._abrir_conexao_leitura()
+        try:
+            return pd.read_sql(query, conn, dtype=dtype)
+        finally:
+            conn.close()
+
+    def _consultar_linha(self, query):
+        """
+        Executa uma consulta de uma única linha (estatísticas) direto no cursor.
+        
+        Args:
+            query: Consulta SQL que retorna uma linha
+            
+        Returns:
+            dict: Valores da linha indexados pelo nome da coluna
+        """
+        cursor = self.conn.execute(query)
+        linha = cursor.fetchone()
+        return dict(zip((coluna[0] for coluna in cursor.description), linha))
+
+    def _ler_consultas_paralelo(self, consultas, tipos=None):
+        """
+        Lê várias consultas independentes em paralelo, cada uma em sua conexão.
+        
+        Args:
+            consultas: Dicionário {nome: query}
+            tipos: Dicionário {nome: dtype} com os tipos conhecidos de cada consulta (opcional)
+            
+        Returns:
+            dict: Dicionário {nome: DataFrame} na mesma ordem das consultas
+        """
+        tipos = tipos or {}
+        if len(consultas) <= 1:
+            return {
+                nome: pd.read_sql(query, self.conn, dtype=tipos.get(nome))
+                for nome, query in consultas.items()
+            }
+
+        # Conexões de leitura só enxergam o que já foi confirmado
+        self.conn.commit()
+        with ThreadPoolExecutor(max_workers=min(4, len(consultas))) as executor:
+            futuros = {
+                nome: executor.submit(self._ler_consulta, query, tipos.get(nome))
+                for nome, query in consultas.items()
+            }
+            return {nome: futuro.result() for nome, futuro in futuros.items()}
+
+    def _criar_indices(self, cursor, analisar=False):
+        """
+        Cria os índices usados pelas consultas de conciliação.
+        As tabelas importadas são recriadas pelo to_sql, por isso os índices
+        são garantidos novamente antes de cada processamento.
+        
+        Args:
+            cursor: Cursor da conexão ativa
+            analisar: Se True, executa ANALYZE para atualizar as estatísticas do planejador
+        """
+        indices = {
+            'idx_adi_cod': f"{self.settings.TABLE_ADIANTAMENTO} (codigo_fornecedor)",
+            'idx_adi_desc_trim': f"{self.settings.TABLE_ADIANTAMENTO} (TRIM(descricao_fornecedor))",
+            'idx_res_adi_cod': f"{self.settings.TABLE_RESULTADO_ADIANTAMENTO} (codigo_fornecedor)",
+            'idx_fin_tipo': f"{self.settings.TABLE_FINANCEIRO} (UPPER(tipo_titulo), excluido)",
+            # Parcial e já na ordem da exportação: lê os títulos ativos sem ordenação temporária
+            'idx_fin_ordem': f"{self.settings.TABLE_FINANCEIRO} (fornecedor, titulo, parcela, UPPER(tipo_titulo)) WHERE excluido = 0",
+            'idx_ci_conta': f"{self.settings.TABLE_CONTAS_ITENS} (conta_contabil)",
+        }
+        for nome, definicao in indices.items():
+            try:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+            except sqlite3.Error as e:
+                logger.warning(f"Não foi possível criar o índice {nome}: {e}")
+        
+        if analisar:
+            cursor.execute("ANALYZE")
+
     def aplicar_sugestoes_colunas(self, df, missing_mappings):
         """
         Aplica sugestões automáticas para mapeamento de colunas faltantes.
@@ -311,12 +726,12 @@ class DatabaseManager:
             # Lê o arquivo conforme o formato
             if ext == ".xlsx":
                 # Lê as primeiras linhas para diagnóstico
-                df_sample = pd.read_excel(file_path, nrows=5)
+                df_sample = pd.read_excel(file_path, nrows=5, engine=_EXCEL_ENGINE)
                 logger.info(f"Primeiras 5 linhas do arquivo {file_path}:")
                 logger.info(df_sample.to_string())
                 
                 # Lê o arquivo completo a partir da linha 2 (header=1)
-                df = pd.read_excel(file_path, header=1)
+                df = pd.read_excel(file_path, header=1, engine=_EXCEL_ENGINE)
 
             elif ext == ".xml":
                 try:
@@ -607,21 +1022,22 @@ class DatabaseManager:
                         # Substitui valores vazios por NaN
                         df[date_col] = df[date_col].replace(['', 'nan', 'None', 'NaT'], np.nan)
                         
-                        # Tenta converter para datetime
-                        df[date_col] = pd.to_datetime(
-                        df[date_col],
-                        dayfirst=True,   # aceita tanto 01/09/2025 quanto 2025-09-01
-                        errors='coerce'
-                    )
-
+                        # Converte com formato explícito (sem inferência por elemento);
+                        # datas únicas são analisadas uma única vez (cache)
+                        datas = pd.to_datetime(df[date_col], format='%d/%m/%Y', errors='coerce', cache=True)
                         
-                        # Se não conseguir com formato específico, tenta inferir
-                        if df[date_col].isna().any():
-                            df[date_col] = df[date_col].dt.strftime('%Y-%m-%d')
-
+                        # O que não estiver em DD/MM/YYYY é tentado como ISO (2025-09-01 [00:00:00])
+                        restantes = datas.isna() & df[date_col].notna()
+                        if restantes.any():
+                            datas[restantes] = pd.to_datetime(
+                                df.loc[restantes, date_col],
+                                format='ISO8601',
+                                errors='coerce',
+                                cache=True
+                            )
                         
                         # Formata para string no formato brasileiro
-                        df[date_col] = df[date_col].dt.strftime('%d/%m/%Y')
+                        df[date_col] = datas.dt.strftime('%d/%m/%Y')
                         
                         # Substitui NaT por None
                         df[date_col] = df[date_col].replace('NaT', None)
@@ -744,7 +1160,7 @@ class DatabaseManager:
                 if col in df.columns:
                     # Primeiro tenta aplicar a formatação de crédito se necessário
                     if col == 'credito':
-                        df[col] = df[col].apply(self.formatar_credito)
+                        df[col] = self.formatar_credito_serie(df[col])
                     else:
                         # Para outras colunas, usa conversão direta
                         df[col] = pd.to_numeric(
@@ -798,6 +1214,37 @@ class DatabaseManager:
 
         return valor_float  # Retorna o valor numérico, não formatado
 
+    def formatar_credito_serie(self, serie):
+        """
+        Versão vetorizada de formatar_credito para uma coluna inteira.
+        
+        Args:
+            serie: Valores no formato do Protheus (ex.: "1.234,56 C")
+            
+        Returns:
+            pd.Series: Valores numéricos (crédito negativo, débito positivo; vazio como NaN)
+        """
+        texto = serie.astype(str).str.strip()
+        
+        # Verifica se é crédito (C) ou débito (D)
+        is_credito = texto.str.endswith("C").to_numpy(bool)
+        is_debito = texto.str.endswith("D").to_numpy(bool)
+        
+        # Mantém apenas dígitos e vírgula; a vírgula passa a ser o separador decimal
+        numeros = texto.str.replace(r'[^\d,]', '', regex=True).str.replace(',', '.', regex=False)
+        valores = pd.to_numeric(numeros, errors='coerce')
+        
+        invalidos = valores.isna() & serie.notna()
+        if invalidos.any():
+            exemplos = serie[invalidos].head(5).tolist()
+            logger.warning(f"Erro ao converter {int(invalidos.sum())} valores (ex.: {exemplos}); assumidos como 0")
+        
+        valores = valores.fillna(0.0).to_numpy(dtype='float64')
+        
+        # Ajusta o sinal baseado no tipo (C ou D)
+        valores = np.where(is_credito, -np.abs(valores), np.where(is_debito, np.abs(valores), valores))
+        return pd.Series(valores, index=serie.index).where(serie.notna())
+
 
     def _clean_contas_itens_data(self, df):
         """
@@ -829,13 +1276,13 @@ class DatabaseManager:
                     df[col] = None
 
             if 'credito' in df.columns:
-                df['credito'] = df['credito'].apply(self.formatar_credito)
+                df['credito'] = self.formatar_credito_serie(df['credito'])
 
             if 'saldo_anterior' in df.columns:
-                df['saldo_anterior'] = df['saldo_anterior'].apply(self.formatar_credito)
+                df['saldo_anterior'] = self.formatar_credito_serie(df['saldo_anterior'])
 
             if 'saldo_atual' in df.columns:
-                df['saldo_atual'] = df['saldo_atual'].apply(self.formatar_credito)
+                df['saldo_atual'] = self.formatar_credito_serie(df['saldo_atual'])
 
             return df
         except Exception as e:
@@ -875,13 +1322,13 @@ class DatabaseManager:
 
             # Aplica a formatação de crédito nas mesmas colunas
             if 'credito' in df.columns:
-                df['credito'] = df['credito'].apply(self.formatar_credito)
+                df['credito'] = self.formatar_credito_serie(df['credito'])
 
             if 'saldo_anterior' in df.columns:
-                df['saldo_anterior'] = df['saldo_anterior'].apply(self.formatar_credito)
+                df['saldo_anterior'] = self.formatar_credito_serie(df['saldo_anterior'])
 
             if 'saldo_atual' in df.columns:
-                df['saldo_atual'] = df['saldo_atual'].apply(self.formatar_credito)
+                df['saldo_atual'] = self.formatar_credito_serie(df['saldo_atual'])
 
             return df[list(self.settings.COLUNAS_ADIANTAMENTO.keys())]
         except Exception as e:
@@ -932,6 +1379,9 @@ class DatabaseManager:
             self.conn.execute("BEGIN TRANSACTION")
             cursor = self.conn.cursor()
             
+            # Recria os índices das tabelas importadas e atualiza as estatísticas
+            self._criar_indices(cursor, analisar=True)
+            
             # Obtém período de referência
             data_inicial, data_final = self._get_datas_referencia()
             
@@ -940,164 +1390,22 @@ class DatabaseManager:
             cursor.execute(f"DELETE FROM {self.settings.TABLE_RESULTADO_ADIANTAMENTO}")
 
             #  CORREÇÃO: Query consolidada para fornecedores do financeiro (NF/FT)
-            query_consolidada = f"""
-                INSERT INTO {self.settings.TABLE_RESULTADO}
-                (codigo_fornecedor, descricao_fornecedor, saldo_financeiro, saldo_contabil, status)
-                
-                -- Busca fornecedores do financeiro (NF/FT)
-                SELECT 
-                    COALESCE(NULLIF(TRIM(f.codigo_fornecedor), ''), TRIM(f.fornecedor)) as codigo_fornecedor,
-                    COALESCE(NULLIF(TRIM(f.descricao_fornecedor), ''), TRIM(f.fornecedor)) as descricao_fornecedor,
-                    SUM(COALESCE(f.valor_original, 0)) as saldo_financeiro,
-                    0 as saldo_contabil,  -- Será atualizado depois
-                    'Pendente' as status
-                FROM 
-                    {self.settings.TABLE_FINANCEIRO} f
-                WHERE 
-                    f.excluido = 0
-                    AND UPPER(f.tipo_titulo) IN ('NF','FT')
-                GROUP BY 
-                    COALESCE(NULLIF(TRIM(f.codigo_fornecedor), ''), TRIM(f.fornecedor)),
-                    COALESCE(NULLIF(TRIM(f.descricao_fornecedor), ''), TRIM(f.fornecedor))
-            """
-            cursor.execute(query_consolidada)
+            cursor.execute(self._queries['consolidada'])
 
             #  CORREÇÃO CRÍTICA: Atualiza com valores contábeis APENAS da conta correta (Fornecedores Nacionais)
-            query_atualiza_contabil = f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET 
-                    saldo_contabil = (
-                        SELECT COALESCE(SUM(ci.saldo_atual), 0)
-                        FROM {self.settings.TABLE_CONTAS_ITENS} ci
-                        WHERE 
-                            ci.conta_contabil LIKE '2.01.02.01.0001%'
-                            AND REPLACE(REPLACE(UPPER(TRIM(ci.codigo_fornecedor)), 'AF', ''), 'F', '') =
-                                REPLACE(REPLACE(UPPER(TRIM({self.settings.TABLE_RESULTADO}.codigo_fornecedor)), 'AF', ''), 'F', '')
-                            AND ci.codigo_fornecedor IS NOT NULL
-                            AND ci.codigo_fornecedor != ''
-                    ),
-                    detalhes = (
-                        SELECT GROUP_CONCAT(
-                            'Conta: ' || ci.conta_contabil || 
-                            ' | Item: ' || ci.descricao_item || 
-                            ' | Valor: R$ ' || ROUND(COALESCE(ci.saldo_atual, 0), 2), ' | '
-                        )
-                        FROM {self.settings.TABLE_CONTAS_ITENS} ci
-                        WHERE 
-                            ci.conta_contabil LIKE '2.01.02.01.0001%'
-                            AND REPLACE(REPLACE(UPPER(TRIM(ci.codigo_fornecedor)), 'AF', ''), 'F', '') =
-                                REPLACE(REPLACE(UPPER(TRIM({self.settings.TABLE_RESULTADO}.codigo_fornecedor)), 'AF', ''), 'F', '')
-                            AND ci.codigo_fornecedor IS NOT NULL
-                            AND ci.codigo_fornecedor != ''
-                    )
-                WHERE EXISTS (
-                    SELECT 1
-                    FROM {self.settings.TABLE_CONTAS_ITENS} ci2
-                    WHERE 
-                        ci2.conta_contabil LIKE '2.01.02.01.0001%'
-                        AND REPLACE(REPLACE(UPPER(TRIM(ci2.codigo_fornecedor)), 'AF', ''), 'F', '') =
-                            REPLACE(REPLACE(UPPER(TRIM({self.settings.TABLE_RESULTADO}.codigo_fornecedor)), 'AF', ''), 'F', '')
-                        AND ci2.codigo_fornecedor IS NOT NULL
-                        AND ci2.codigo_fornecedor != ''
-                )
-            """
-
-
-            cursor.execute(query_atualiza_contabil)
+            cursor.execute(self._queries['atualiza_contabil'])
 
             #  CORREÇÃO: Adiciona adiantamentos aos saldos contábeis (conta específica)
-            query_adiantamento = f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET 
-                    saldo_contabil = saldo_contabil + (
-                        SELECT COALESCE(SUM(saldo_atual), 0)
-                        FROM {self.settings.TABLE_ADIANTAMENTO} a
-                        WHERE 
-                            --  FILTRO DA CONTA DE ADIANTAMENTO
-                            a.conta_contabil LIKE '1.01.06.02.0001%'
-                            AND a.codigo_fornecedor = {self.settings.TABLE_RESULTADO}.codigo_fornecedor
-                    )
-                WHERE EXISTS (
-                    SELECT 1
-                    FROM {self.settings.TABLE_ADIANTAMENTO} a2
-                    WHERE 
-                        a2.conta_contabil LIKE '1.01.06.02.0001%'
-                        AND a2.codigo_fornecedor = {self.settings.TABLE_RESULTADO}.codigo_fornecedor
-                )
-            """
-            cursor.execute(query_adiantamento)
+            cursor.execute(self._queries['adiantamento'])
 
             #  CORREÇÃO: Insere fornecedores contábeis que não existem no financeiro
-            query_contabeis_faltantes = f"""
-                INSERT INTO {self.settings.TABLE_RESULTADO}
-                (codigo_fornecedor, descricao_fornecedor, saldo_financeiro, saldo_contabil, status)
-                
-                SELECT 
-                    COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor) as codigo_fornecedor,
-                    COALESCE(NULLIF(TRIM(ci.descricao_fornecedor), ''), ci.descricao_item) as descricao_fornecedor,
-                    0 as saldo_financeiro,
-                    SUM(COALESCE(ci.saldo_atual, 0)) as saldo_contabil,
-                    'Pendente' as status
-                FROM 
-                    {self.settings.TABLE_CONTAS_ITENS} ci
-                WHERE 
-                    ci.conta_contabil LIKE '2.01.02.01.0001%'
-                    AND NOT EXISTS (
-                        SELECT 1
-                        FROM {self.settings.TABLE_RESULTADO} r
-                        WHERE r.codigo_fornecedor = COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor)
-                    )
-                GROUP BY 
-                    COALESCE(NULLIF(TRIM(ci.codigo_fornecedor), ''), ci.descricao_fornecedor),
-                    COALESCE(NULLIF(TRIM(ci.descricao_fornecedor), ''), ci.descricao_item)
-            """
-            cursor.execute(query_contabeis_faltantes)
+            cursor.execute(self._queries['contabeis_faltantes'])
             
             # Cálculo de diferenças e status
-            query_diferenca = f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET 
-                    diferenca = ROUND(COALESCE(saldo_contabil, 0) - COALESCE(saldo_financeiro, 0), 2),
-                    status = CASE 
-                        WHEN saldo_contabil IS NULL AND saldo_financeiro IS NULL THEN 'Pendente'
-                        WHEN ABS(COALESCE(saldo_financeiro, 0) - COALESCE(saldo_contabil, 0)) <= 
-                            (0.03 * CASE 
-                                WHEN ABS(COALESCE(saldo_contabil, 0)) > ABS(COALESCE(saldo_financeiro, 0)) 
-                                THEN ABS(COALESCE(saldo_contabil, 0)) 
-                                ELSE ABS(COALESCE(saldo_financeiro, 0)) 
-                            END)
-                            THEN 'Conferido' 
-                        ELSE 'Divergente' 
-                    END
-            """
-            cursor.execute(query_diferenca)
+            cursor.execute(self._queries['diferenca'])
             
             # Query para investigação de divergências
-            query_investigacao = f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET detalhes = COALESCE(detalhes, '') || 
-                    ' | Divergência: R$ ' || ABS(diferenca) || 
-                    '. Itens Contábeis encontrados: ' || 
-                    COALESCE(
-                        (SELECT COUNT(*) || ' itens'
-                        FROM {self.settings.TABLE_CONTAS_ITENS} ci
-                        WHERE (ci.codigo_fornecedor = {self.settings.TABLE_RESULTADO}.codigo_fornecedor 
-                                OR ci.descricao_fornecedor = {self.settings.TABLE_RESULTADO}.descricao_fornecedor)
-                        AND ci.conta_contabil LIKE '2.01.02.01.0001%'),
-                        'Nenhum item específico encontrado'
-                    )
-                WHERE status = 'Divergente'
-            """
-            cursor.execute(query_investigacao)
-            
-            # Para fornecedores divergentes sem itens específicos
-            cursor.execute(f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET detalhes = 'Divergência: R$ ' || ABS(diferenca) || 
-                            '. Investigar manualmente no sistema. Nenhum item contábil específico encontrado para análise automática.'
-                WHERE status = 'Divergente' 
-                AND (detalhes IS NULL OR detalhes = '')
-            """)
+            cursor.execute(self._queries['investigacao'])
             
             # Classifica por ordem de importância
             try:
@@ -1112,19 +1420,8 @@ class DatabaseManager:
             except Exception as rank_error:
                 logger.error(f"Erro ao classificar por importância: {rank_error}")
 
-            # Atualiza detalhes para registros não divergentes
-            cursor.execute(f"""
-                UPDATE {self.settings.TABLE_RESULTADO}
-                SET detalhes = 
-                    CASE 
-                        WHEN status = 'Conferido' THEN 'Conciliação dentro da tolerância'
-                        WHEN status = 'Pendente' THEN 'Financeiro: R$ ' || COALESCE(saldo_financeiro, 0) || 
-                                                    ' | Contábil: R$ ' || COALESCE(saldo_contabil, 0) || 
-                                                    ' | Diferença: R$ ' || COALESCE(diferenca, 0)
-                        ELSE detalhes  -- Mantém os detalhes da investigação para divergências
-                    END
-                WHERE detalhes IS NULL OR detalhes = ''
-            """)
+            # Preenche os detalhes ainda vazios (conferidos, pendentes e divergentes sem itens)
+            self._atualizar_detalhes_resultado(cursor)
             
             # Processamento de adiantamentos
             self._process_adiantamentos()
@@ -1138,6 +1435,49 @@ class DatabaseManager:
             logger.error(error_msg, exc_info=True)
             self.conn.rollback()
             raise ExcecaoNaoMapeadaError(error_msg) from e
+
+    def _atualizar_detalhes_resultado(self, cursor):
+        """
+        Preenche os detalhes vazios da tabela de resultado.
+        A montagem dos textos é feita de forma vetorizada no pandas e gravada
+        com um único executemany.
+        
+        Args:
+            cursor: Cursor da transação em andamento
+        """
+        df = pd.read_sql(f"""
+            SELECT id, status, saldo_financeiro, saldo_contabil, diferenca
+            FROM {self.settings.TABLE_RESULTADO}
+            WHERE detalhes IS NULL OR detalhes = ''
+        """, self.conn)
+        if df.empty:
+            return
+        
+        financeiro = df['saldo_financeiro'].fillna(0).round(2).astype(str)
+        contabil = df['saldo_contabil'].fillna(0).round(2).astype(str)
+        diferenca = df['diferenca'].fillna(0).round(2)
+        
+        detalhes = pd.Series(None, index=df.index, dtype=object)
+        detalhes[df['status'] == 'Conferido'] = 'Conciliação dentro da tolerância'
+        pendente = df['status'] == 'Pendente'
+        detalhes[pendente] = (
+            'Financeiro: R$ ' + financeiro[pendente] +
+            ' | Contábil: R$ ' + contabil[pendente] +
+            ' | Diferença: R$ ' + diferenca[pendente].astype(str)
+        )
+        # Divergentes sem itens específicos para análise automática
+        divergente = df['status'] == 'Divergente'
+        detalhes[divergente] = (
+            'Divergência: R$ ' + diferenca[divergente].abs().astype(str) +
+            '. Investigar manualmente no sistema. Nenhum item contábil específico encontrado para análise automática.'
+        )
+        
+        preenchidos = detalhes.notna()
+        cursor.executemany(
+            f"UPDATE {self.settings.TABLE_RESULTADO} SET detalhes = ? WHERE id = ?",
+            zip(detalhes[preenchidos], df.loc[preenchidos, 'id'].astype(int).tolist())
+        )
+
     def _get_datas_referencia(self, data_referencia=None):
         """
         Calcula as datas inicial e final para o relatório Contas X Itens
@@ -1189,15 +1529,23 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             
-            # Verifica totais financeiros vs contábeis
+            # Verifica totais financeiros vs contábeis em uma única passagem
+            placeholders = ", ".join("?" for _ in _TIPOS_TITULO_NAO_FORNECEDOR)
             query = f"""
                 SELECT 
-                    (SELECT SUM(saldo_devedor) FROM {self.settings.TABLE_FINANCEIRO} 
-                    WHERE excluido = 0 AND UPPER(tipo_titulo) NOT IN ('NDF', 'PA', 'BOL', 'EMP', 'TX', 'INS', 'ISS', 'TXA', 'IRF')) as total_financeiro,
-                    (SELECT SUM(saldo_atual) FROM {self.settings.TABLE_MODELO1} 
-                    WHERE descricao_conta LIKE 'FORNECEDOR%') as total_contabil
+                    SUM(CASE WHEN origem = 'fin' THEN valor END) as total_financeiro,
+                    SUM(CASE WHEN origem = 'ctb' THEN valor END) as total_contabil
+                FROM (
+                    SELECT 'fin' as origem, saldo_devedor as valor
+                    FROM {self.settings.TABLE_FINANCEIRO} 
+                    WHERE excluido = 0 AND UPPER(tipo_titulo) NOT IN ({placeholders})
+                    UNION ALL
+                    SELECT 'ctb' as origem, saldo_atual as valor
+                    FROM {self.settings.TABLE_MODELO1} 
+                    WHERE descricao_conta LIKE 'FORNECEDOR%'
+                )
             """
-            cursor.execute(query)
+            cursor.execute(query, _TIPOS_TITULO_NAO_FORNECEDOR)
             totals = cursor.fetchone()
             
             diferenca_percentual = abs(totals[0] - totals[1]) / max(totals[0], totals[1]) * 100
@@ -1211,231 +1559,237 @@ class DatabaseManager:
             logger.error(error_msg)
             return False
 
-    def _apply_metadata_styles(self, worksheet, metadata_items, metadata_values):
+    def _registrar_estilo(self, workbook, estilo):
         """
-        Aplica estilos à aba de metadados de forma otimizada.
+        Registra um NamedStyle no workbook caso ainda não exista.
+        
+        Args:
+            workbook: Workbook do openpyxl
+            estilo: NamedStyle a ser registrado
+            
+        Returns:
+            str: Nome do estilo, para atribuição via cell.style
+        """
+        if estilo.name not in workbook.named_styles:
+            workbook.add_named_style(estilo)
+        return estilo.name
+
+    def _apply_metadata_styles(self, worksheet, metadata):
+        """
+        Aplica estilos à aba de metadados usando um estilo nomeado no cabeçalho.
+        
+        Args:
+            worksheet: Aba de metadados já preenchida
+            metadata: Pares (item, valor) gravados na aba
         """
         try:
-            # Define estilos
-            title_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            title_font = Font(color="FFFFFF", bold=True, size=14)
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            thin_border = Border(
-                left=Side(style='thin'), 
-                right=Side(style='thin'), 
-                top=Side(style='thin'), 
-                bottom=Side(style='thin')
-            )
+            # Estilo nomeado registrado uma única vez no workbook
+            estilo_cabecalho = NamedStyle(name="meta_cabecalho", fill=HEADER_FILL, font=HEADER_FONT, border=THIN_BORDER)
+            nome_cabecalho = self._registrar_estilo(worksheet.parent, estilo_cabecalho)
             
-            # Formata título (primeira linha)
-            for row in worksheet.iter_rows(min_row=1, max_row=1):
-                for cell in row:
-                    cell.fill = title_fill
-                    cell.font = title_font
-                    cell.border = thin_border
-            
-            # Formata cabeçalho (segunda linha)
-            for row in worksheet.iter_rows(min_row=2, max_row=2):
-                for cell in row:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.border = thin_border
-            
-            # Aplica bordas a todas as células restantes
-            for row in worksheet.iter_rows(min_row=3, max_row=worksheet.max_row):
-                for cell in row:
-                    cell.border = thin_border
-            
-            # Ajusta largura das colunas
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                for cell in column:
-                    try:
-                        if cell.value is not None and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
+            # Formata o cabeçalho Item/Valor (primeira linha, gravada pelo to_excel)
+            for cell in worksheet[1]:
+                cell.style = nome_cabecalho
+            
+            # Ajusta largura das colunas a partir dos dados de origem
+            for col_idx, valores in enumerate(zip(*metadata), 1):
+                max_length = max((len(str(v)) for v in valores if v is not None), default=0)
                 adjusted_width = min((max_length + 2) * 1.2, 50)  # Limita a largura máxima
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
 
-            for row_idx, (item, value) in enumerate(zip(metadata_items, metadata_values), 1):
+            # Dados a partir da linha 2 (a linha 1 é o cabeçalho Item/Valor do to_excel)
+            for row_idx, (item, value) in enumerate(metadata, 2):
                 if '---' in str(item) or '---' in str(value):
                     # Aplica fundo cinza para separadores
                     for col in range(1, 3):
-                        cell = worksheet.cell(row=row_idx, column=col)
-                        cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+                        worksheet.cell(row=row_idx, column=col).fill = GRAY_FILL
                         
         except Exception as e:
             logger.warning(f"Erro ao aplicar estilos de metadados: {e}")
             
-    def _apply_styles(self, worksheet):
+    def _registrar_estilos_planilha(self, workbook):
+        """
+        Registra no workbook os estilos nomeados usados nas abas de dados.
+        Cada célula recebe o estilo por nome, evitando criar objetos de
+        preenchimento, fonte e borda célula a célula.
+        
+        Args:
+            workbook: Workbook do openpyxl
+        """
+        # O cabeçalho é registrado por último: sua presença indica que o conjunto já está completo
+        if "cabecalho" in workbook.named_styles:
+            return
+        
+        fills = {'verde': GREEN_FILL, 'vermelho': RED_FILL, 'amarelo': YELLOW_FILL}
+        
+        # Estilos do corpo: linhas coloridas por status e célula de diferença destacada
+        estilos_corpo = {"corpo": {}}
+        for cor, fill in fills.items():
+            estilos_corpo[f"corpo_{cor}"] = {'fill': fill}
+            estilos_corpo[f"destaque_{cor}"] = {'fill': fill, 'font': RED_FONT}
+        
+        # Cada estilo do corpo tem uma variante monetária, aplicada na mesma atribuição
+        for nome, atributos in estilos_corpo.items():
+            self._registrar_estilo(workbook, NamedStyle(name=nome, border=THIN_BORDER, **atributos))
+            self._registrar_estilo(workbook, NamedStyle(
+                name=f"{nome}_moeda",
+                border=THIN_BORDER,
+                number_format=MONEY_FORMAT,
+                **atributos
+            ))
+        
+        self._registrar_estilo(workbook, NamedStyle(
+            name="cabecalho",
+            fill=HEADER_FILL,
+            font=HEADER_FONT,
+            alignment=ALIGN_CENTER,
+            border=THIN_BORDER
+        ))
+
+    def _apply_styles_core(self, worksheet, estilos, df=None):
+        """
+        Renderizador comum das abas: cabeçalho, estilo de cada célula do corpo e larguras.
+        
+        Args:
+            worksheet: Aba a ser formatada
+            estilos: Matriz (linhas x colunas) com o nome do estilo de cada célula do corpo
+            df: DataFrame que originou a aba; quando informado, as larguras são
+                calculadas a partir dele, sem reler as células
+        """
+        self._registrar_estilos_planilha(worksheet.parent)
+        
+        # Dimensões calculadas uma única vez (max_row/max_column percorrem as células)
+        max_row = worksheet.max_row
+        max_col = worksheet.max_column
+        
+        # Aplica estilos ao cabeçalho em lote
+        for row in worksheet.iter_rows(min_row=1, max_row=1, max_col=max_col):
+            for cell in row:
+                cell.style = "cabecalho"
+        
+        # Aplica os estilos pré-calculados (já incluem bordas, cores e formato monetário)
+        for row, estilos_linha in zip(worksheet.iter_rows(min_row=2, max_row=max_row, max_col=max_col), estilos):
+            for cell, estilo in zip(row, estilos_linha):
+                cell.style = estilo
+        
+        # Ajusta largura das colunas pelo maior texto entre cabeçalho e valores
+        if df is not None:
+            for col_idx, col in enumerate(df.columns, 1):
+                tamanhos = df[col].dropna().astype(str).str.len()
+                max_length = max(len(str(col)), int(tamanhos.max()) if len(tamanhos) else 0)
+                adjusted_width = min((max_length + 2) * 1.2, 50)  # Limita a largura máxima
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+        else:
+            for col_idx, valores in enumerate(worksheet.iter_cols(max_row=max_row, max_col=max_col, values_only=True), 1):
+                max_length = max((len(str(v)) for v in valores if v is not None), default=0)
+                adjusted_width = min((max_length + 2) * 1.2, 50)  # Limita a largura máxima
+                worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+
+    def _dataframe_da_planilha(self, worksheet):
+        """
+        Lê o corpo de uma aba como DataFrame, com o cabeçalho como colunas.
+        
+        Args:
+            worksheet: Aba de origem
+            
+        Returns:
+            pd.DataFrame: Valores da aba, na ordem das linhas e colunas
+        """
+        linhas = worksheet.iter_rows(min_row=2, values_only=True)
+        return pd.DataFrame(list(linhas), columns=[c.value for c in worksheet[1]])
+
+    def _apply_styles(self, worksheet, df=None):
         """
         Aplica estilos visuais básicos à planilha Excel de forma otimizada.
+        
+        Args:
+            worksheet: Aba a ser formatada
+            df: DataFrame que originou a aba; quando informado, as decisões de
+                formato e as larguras são calculadas por coluna, sem reler as células
         """
         try:
-            # Define estilos
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            align_center = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(
-                left=Side(style='thin'), 
-                right=Side(style='thin'), 
-                top=Side(style='thin'), 
-                bottom=Side(style='thin')
-            )
-            
-            # Aplica estilos ao cabeçalho em lote
-            for row in worksheet.iter_rows(min_row=1, max_row=1):
-                for cell in row:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = align_center
-                    cell.border = thin_border
-            
-            # Identifica colunas monetárias
             header = [c.value for c in worksheet[1] if c.value is not None]
-            monetary_headers = {
-                'Valor Financeiro', 'Valor Contábil', 'Diferença',
-                'Valor em Aberto', 'Valor Provisionado', 'Saldo Atual',
-                'Débito', 'Crédito', 'Valor Original', 'Saldo Devedor',
-                'Quantidade', 'Valor Unitário', 'Valor Total'
-            }
+            if df is None or list(df.columns) != header:
+                df = self._dataframe_da_planilha(worksheet)
             
-            # Aplica formatação monetária em colunas inteiras 
-            for col_idx, col_name in enumerate(header, 1):
-                if col_name in monetary_headers:
-                    col_letter = get_column_letter(col_idx)
-                    for cell in worksheet[col_letter][1:]:  # Pula o cabeçalho
-                        if cell.value is not None and isinstance(cell.value, (int, float)):
-                            cell.number_format = 'R$ #,##0.00;[Red]R$ -#,##0.00'
-            
-            # Aplica bordas a todas as células (em lote por linha)
-            for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-                for cell in row:
-                    cell.border = thin_border
-            
-            # Ajusta largura das colunas automaticamente
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                for cell in column:
-                    try:
-                        if cell.value is not None and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min((max_length + 2) * 1.2, 50)  # Limita a largura máxima
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+            # Estilo de cada célula decidido por coluna a partir do DataFrame
+            estilos_colunas = [self._estilos_coluna(df[col], col in MONETARY_HEADERS) for col in df.columns]
+            estilos = np.column_stack(estilos_colunas) if estilos_colunas else np.empty((len(df), 0), dtype=object)
+            self._apply_styles_core(worksheet, estilos, df)
                 
         except Exception as e:
             logger.warning(f"Erro ao aplicar estilos básicos: {e}")
 
-    def _apply_enhanced_styles(self, worksheet, stats):
-        """
-        Aplica estilos visuais melhorados com formatação otimizada.
+    def _valores_numericos(self, serie):
         """
-        try:
-            # Cores para formatação condicional (DEFINIR NO INÍCIO DO MÉTODO)
-            red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            yellow_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-            red_font = Font(color="9C0006", bold=True)
-            
-            # Define estilos
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            align_center = Alignment(horizontal="center", vertical="center")
-            thin_border = Border(
-                left=Side(style='thin'), 
-                right=Side(style='thin'), 
-                top=Side(style='thin'), 
-                bottom=Side(style='thin')
-            )
+        Indica, de forma vetorizada, quais valores da coluna são numéricos.
+        
+        Args:
+            serie: Valores da coluna
             
-            # Aplica estilos ao cabeçalho em lote
-            for row in worksheet.iter_rows(min_row=1, max_row=1):
-                for cell in row:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = align_center
-                    cell.border = thin_border
+        Returns:
+            np.ndarray: Máscara booleana dos valores que recebem formato monetário
+        """
+        if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            return serie.notna().to_numpy()
+        return serie.map(lambda v: isinstance(v, (int, float)) and not pd.isna(v)).to_numpy(bool)
+
+    def _estilos_coluna(self, serie, monetaria):
+        """
+        Define o estilo de cada célula de uma coluna em uma única operação.
+        
+        Args:
+            serie: Valores da coluna, na ordem das linhas da planilha
+            monetaria: Se a coluna recebe formatação monetária
             
-            # Identifica índices de colunas para formatação monetária
-            header = [c.value for c in worksheet[1] if c.value is not None]
-            monetary_columns = [
-                'Valor Financeiro', 'Valor Contábil', 'Diferença',
-                'Valor em Aberto', 'Valor Provisionado', 'Saldo Atual',
-                'Débito', 'Crédito'
-            ]
+        Returns:
+            np.ndarray: Nome do estilo de cada célula
+        """
+        if not monetaria:
+            return np.full(len(serie), "corpo", dtype=object)
+        return np.where(self._valores_numericos(serie), "corpo_moeda", "corpo").astype(object)
+
+    def _calcular_estilos_linhas(self, df):
+        """
+        Pré-calcula de forma vetorizada o estilo de cada célula do resumo:
+        cor da linha pelo status, destaque da diferença e formato monetário por coluna.
+        
+        Args:
+            df: DataFrame na mesma ordem das linhas e colunas da planilha
             
-            # Aplica formatação monetária em colunas inteiras
-            for col_idx, col_name in enumerate(header, 1):
-                if col_name in monetary_columns:
-                    col_letter = get_column_letter(col_idx)
-                    for cell in worksheet[col_letter][1:]:  # Pula o cabeçalho
-                        if cell.value is not None and isinstance(cell.value, (int, float)):
-                            cell.number_format = 'R$ #,##0.00;[Red]R$ -#,##0.00'
-            
-            # Identifica colunas de status e diferença
-            status_idx = header.index("Status") + 1 if "Status" in header else None
-            diferenca_idx = header.index("Diferença") + 1 if "Diferença" in header else None
-            if diferenca_idx:
-                diff_cell = row[diferenca_idx-1]
-                if diff_cell.value is not None and diff_cell.value != 0:
-                    diff_cell.fill = red_fill  # ou amarelo_fill, se preferir apenas destacar
-
-            # Cores para formatação condicional
-            red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            yellow_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-            
-            red_font = Font(color="9C0006", bold=True)
-            
-            # Aplica formatação condicional por linhas (mais eficiente)
-            for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-                # Formata valores negativos em vermelho (apenas para coluna Diferença)
-                if diferenca_idx:
-                    diff_cell = row[diferenca_idx-1]
-                    if diff_cell.value is not None and diff_cell.value != 0:
-                        diff_cell.fill = yellow_fill
-                        diff_cell.font = red_font
-
-                # Formatação baseada no status
-                if status_idx:
-                    status_cell = row[status_idx-1]  # -1 porque index começa em 0
-                    status_value = status_cell.value if status_cell.value else ""
-                    
-                    fill_color = None
-                    if status_value == 'Conferido':
-                        fill_color = green_fill
-                    elif status_value == 'Divergente':
-                        fill_color = red_fill
-                    elif status_value == 'Pendente':
-                        fill_color = yellow_fill
-                    
-                    # Aplica o preenchimento apenas se necessário
-                    if fill_color:
-                        for cell in row:
-                            cell.fill = fill_color
-                
-                # Aplica bordas a todas as células
-                for cell in row:
-                    cell.border = thin_border
-            
-            # Ajusta largura das colunas automaticamente
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                for cell in column:
-                    try:
-                        if cell.value is not None and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min((max_length + 2) * 1.2, 50)  # Limita a largura máxima
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        Returns:
+            np.ndarray: Matriz (linhas x colunas) com o nome do estilo de cada célula
+        """
+        if "Status" in df.columns:
+            style_ix = df["Status"].map(STATUS_STYLE_IDX).fillna(0).to_numpy(np.int8)
+        else:
+            style_ix = np.zeros(len(df), dtype=np.int8)
+        
+        estilos = np.repeat(np.array(ROW_STYLES, dtype=object)[style_ix][:, None], len(df.columns), axis=1)
+        
+        # Destaca diferenças diferentes de zero (apenas na coluna Diferença)
+        if "Diferença" in df.columns:
+            diff_flag = (pd.to_numeric(df["Diferença"], errors="coerce").fillna(0) != 0).to_numpy()
+            col_diferenca = df.columns.get_loc("Diferença")
+            estilos[diff_flag, col_diferenca] = np.array(DIFF_STYLES, dtype=object)[style_ix[diff_flag]]
+        
+        # Formato monetário decidido por coluna, na mesma atribuição do estilo
+        for col_idx, col in enumerate(df.columns):
+            if col in RESUMO_MONETARY_HEADERS:
+                numerico = self._valores_numericos(df[col])
+                estilos[numerico, col_idx] = estilos[numerico, col_idx] + "_moeda"
+        
+        return estilos
+
+    def _apply_enhanced_styles(self, worksheet, stats, estilos_linhas=None):
+        """
+        Aplica estilos visuais melhorados com formatação otimizada.
+        """
+        try:
+            # Estilos por célula pré-calculados; na ausência, derivados da própria planilha
+            if estilos_linhas is None:
+                estilos_linhas = self._calcular_estilos_linhas(self._dataframe_da_planilha(worksheet))
+            self._apply_styles_core(worksheet, estilos_linhas)
                 
         except Exception as e:
             logger.warning(f"Erro ao aplicar estilos avançados: {e}")
@@ -1470,16 +1824,20 @@ class DatabaseManager:
                         header = [cell.value for cell in sheet[1] if cell.value is not None]
                         if "Observações" in header:
                             obs_col_idx = header.index("Observações") + 1
-                            for row in range(2, sheet.max_row + 1):
-                                cell = sheet.cell(row=row, column=obs_col_idx)
-                                cell.protection = Protection(locked=False)
+                            desbloqueada = Protection(locked=False)
+                            for (cell,) in sheet.iter_rows(min_row=2, max_row=sheet.max_row, min_col=obs_col_idx, max_col=obs_col_idx):
+                                cell.protection = desbloqueada
         
         except Exception as e:
             logger.warning(f"")
 
     def _process_adiantamentos(self):
         """Processa especificamente a conciliação de adiantamentos para a planilha separada"""
+        # Executa todas as etapas em uma única transação (reaproveita a do chamador, se houver)
+        transacao_propria = not self.conn.in_transaction
         try:
+            if transacao_propria:
+                self.conn.execute("BEGIN IMMEDIATE")
             cursor = self.conn.cursor()
             
             # Limpa a tabela de resultado_adiantamento
@@ -1519,30 +1877,49 @@ class DatabaseManager:
             """
             cursor.execute(query_adiantamento_financeiro)
 
-            #  CORREÇÃO: Atualiza com dados contábeis de adiantamento
+            #  Pré-agrega os adiantamentos contábeis uma única vez (evita subconsultas correlacionadas)
+            cursor.execute("DROP TABLE IF EXISTS temp.tmp_adiantamento_agregado")
+            cursor.execute(f"""
+                CREATE TEMP TABLE tmp_adiantamento_agregado AS
+                SELECT 
+                    codigo_fornecedor,
+                    TRIM(descricao_fornecedor) as descricao_fornecedor_trim,
+                    SUM(saldo_atual) as total,
+                    GROUP_CONCAT(descricao_fornecedor || ': R$ ' || saldo_atual, ' | ') as detalhes
+                FROM 
+                    {self.settings.TABLE_ADIANTAMENTO}
+                GROUP BY 
+                    codigo_fornecedor, TRIM(descricao_fornecedor)
+            """)
+            cursor.execute("CREATE INDEX temp.idx_tmp_adi_codigo ON tmp_adiantamento_agregado (codigo_fornecedor)")
+            cursor.execute("CREATE INDEX temp.idx_tmp_adi_descricao ON tmp_adiantamento_agregado (descricao_fornecedor_trim)")
+
+            #  CORREÇÃO: Atualiza com dados contábeis de adiantamento (join único com a pré-agregação)
+            #  Os detalhes são montados junto com o total: a atualização final de detalhes só
+            #  preenche registros vazios, então conferidos com correspondência mantêm este texto
+            #  na aba "Resumo Adiantamentos" e não há concatenação descartada a evitar
             query_contabil_update = f"""
                 UPDATE {self.settings.TABLE_RESULTADO_ADIANTAMENTO}
                 SET 
-                    total_contabil = (
-                        SELECT COALESCE(SUM(saldo_atual), 0)
-                        FROM {self.settings.TABLE_ADIANTAMENTO} a
-                        WHERE a.codigo_fornecedor = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.codigo_fornecedor
-                        OR TRIM(a.descricao_fornecedor) = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.descricao_fornecedor
-                    ),
-                    detalhes = 'Adiantamento: ' || COALESCE((
-                        SELECT GROUP_CONCAT(a2.descricao_fornecedor || ': R$ ' || a2.saldo_atual, ' | ')
-                        FROM {self.settings.TABLE_ADIANTAMENTO} a2
-                        WHERE a2.codigo_fornecedor = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.codigo_fornecedor
-                        OR TRIM(a2.descricao_fornecedor) = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.descricao_fornecedor
-                    ), 'Nenhum registro contábil')
-                WHERE EXISTS (
-                    SELECT 1
-                    FROM {self.settings.TABLE_ADIANTAMENTO} a3
-                    WHERE a3.codigo_fornecedor = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.codigo_fornecedor
-                    OR TRIM(a3.descricao_fornecedor) = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.descricao_fornecedor
-                )
+                    total_contabil = m.total,
+                    detalhes = 'Adiantamento: ' || COALESCE(m.detalhes, 'Nenhum registro contábil')
+                FROM (
+                    SELECT 
+                        r.id,
+                        COALESCE(SUM(t.total), 0) as total,
+                        GROUP_CONCAT(t.detalhes, ' | ') as detalhes
+                    FROM 
+                        {self.settings.TABLE_RESULTADO_ADIANTAMENTO} r
+                        JOIN tmp_adiantamento_agregado t
+                            ON t.codigo_fornecedor = r.codigo_fornecedor
+                            OR t.descricao_fornecedor_trim = r.descricao_fornecedor
+                    GROUP BY 
+                        r.id
+                ) m
+                WHERE m.id = {self.settings.TABLE_RESULTADO_ADIANTAMENTO}.id
             """
             cursor.execute(query_contabil_update)
+            cursor.execute("DROP TABLE IF EXISTS temp.tmp_adiantamento_agregado")
             
             #  CORREÇÃO: Insere adiantamentos contábeis que não tiveram match financeiro
             query_contabeis_sem_match = f"""
@@ -1608,11 +1985,15 @@ class DatabaseManager:
                 WHERE detalhes IS NULL OR detalhes = ''
             """)
             
+            if transacao_propria:
+                self.conn.commit()
             logger.info("Processamento de adiantamentos concluído com sucesso")
             
         except Exception as e:
             error_msg = f"Erro no processamento de adiantamentos: {e}"
             logger.error(error_msg)
+            if transacao_propria:
+                self.conn.rollback()
             raise
 
     def _recreate_adiantamento_table(self):
@@ -1634,6 +2015,7 @@ class DatabaseManager:
                     data_processamento TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._criar_indices(cursor)
             self.conn.commit()
             logger.info("Tabela resultado_adiantamento recriada com estrutura correta")
         except Exception as e:
@@ -1641,44 +2023,56 @@ class DatabaseManager:
             logger.error(error_msg)
             raise
 
-    def separar_codigo_descricao(self, df, coluna_origem="Fornecedor", col_codigo="Codigo", col_descricao="Descricao"):
+    def _reordenar_colunas(self, df, primeiras, descartar=("Código Fornecedor",)):
+        """
+        Coloca as colunas indicadas no início e descarta a coluna de origem da separação.
+        
+        Args:
+            df: DataFrame a reorganizar
+            primeiras: Colunas que devem vir primeiro, nesta ordem
+            descartar: Colunas removidas do resultado
+            
+        Returns:
+            pd.DataFrame: DataFrame com as colunas reorganizadas
+        """
+        fixas = set(primeiras).union(descartar)
+        return df[[*primeiras, *(col for col in df.columns if col not in fixas)]]
+
+    def separar_codigo_descricao(self, df, coluna_origem="Fornecedor", col_codigo="Codigo", col_descricao="Descricao", com_mascara=False):
         """
         Versão MELHORADA: Extrai todos os dígitos do início da string para a coluna de código
         e remove esses dígitos da descrição.
+        A separação é vetorizada com str.extract sobre a coluna inteira.
+        
+        Com com_mascara=True retorna (df, máscara das linhas cujo código foi extraído),
+        dispensando uma nova varredura da coluna de código para filtrar os vazios.
         """
         if coluna_origem in df.columns:
             df = df.copy()
-            df[col_codigo] = ""
-            df[col_descricao] = ""
-            
-            for idx, valor in df[coluna_origem].items():
-                if pd.notna(valor) and str(valor).strip() != "":
-                    valor_str = str(valor).strip()
-                    
-                    # REGEX MELHORADA: Pega TODOS os dígitos do início, incluindo possíveis separadores
-                    # Captura: 123, 123-456, 123.456, 123 456, etc.
-                    match = re.match(r'^(\d+[\s\-\.\/]*\d*)', valor_str)
-                    
-                    if match:
-                        codigo = match.group(1).strip()
-                        # Remove qualquer caractere não numérico do código (opcional)
-                        codigo_limpo = re.sub(r'[^\d]', '', codigo)  # Mantém apenas dígitos
-                        # Ou mantenha com os separadores: codigo_limpo = codigo
-                        
-                        df.at[idx, col_codigo] = codigo_limpo
-                        # Remove o código encontrado do início da descrição
-                        descricao = valor_str[len(codigo):].strip()
-                        # Remove hífens, pontos ou espaços extras no início
-                        descricao = re.sub(r'^[\s\-\.\/]+', '', descricao)
-                        df.at[idx, col_descricao] = descricao
-                    else:
-                        # Se não tem números no início, coloca vazio no código
-                        df.at[idx, col_codigo] = ""
-                        df.at[idx, col_descricao] = valor_str
-                    
-                    # Log para debug (opcional)
-                    logger.debug(f"'{valor_str}' -> '{df.at[idx, col_codigo]}' / '{df.at[idx, col_descricao]}'")
-            
+            origem = df[coluna_origem]
+            valores = origem.where(origem.notna(), "").astype(str).str.strip()
+            
+            # Caso comum nos resumos: a coluna só traz códigos numéricos, sem descrição.
+            # Uma checagem de dígitos resolve sem passar pelas expressões regulares
+            so_digitos = valores.str.isdecimal()
+            if so_digitos.all():
+                df[col_codigo] = valores
+                df[col_descricao] = ""
+                if com_mascara:
+                    return df, so_digitos
+                return df
+            
+            # Captura: 123, 123-456, 123.456, 123 456, etc. e o restante como descrição
+            partes = valores.str.extract(_CODIGO_DESCRICAO_RE)
+            tem_codigo = partes["codigo"].notna()
+            
+            # Mantém apenas dígitos no código; sem números no início, o código fica vazio
+            df[col_codigo] = partes["codigo"].str.replace(_NAO_DIGITO_RE, "", regex=True).where(tem_codigo, "")
+            # Remove hífens, pontos ou espaços extras no início da descrição
+            df[col_descricao] = partes["descricao"].str.replace(_SEPARADOR_INICIAL_RE, "", regex=True).where(tem_codigo, valores)
+            
+            if com_mascara:
+                return df, tem_codigo
             return df
     
     def export_to_excel(self, export_type="all"):
@@ -1718,65 +2112,75 @@ class DatabaseManager:
             
             # Query para obter estatísticas de processamento
             query_stats = f"""
-                SELECT 
-                    COUNT(*) as total_registros,
-                    SUM(CASE WHEN status = 'Conferido' THEN 1 ELSE 0 END) as conciliados_ok,
-                    SUM(CASE WHEN status = 'Divergente' THEN 1 ELSE 0 END) as divergentes,
-                    SUM(CASE WHEN status = 'Pendente' THEN 1 ELSE 0 END) as pendentes,
-
+                WITH 
                     -- Total Financeiro CORRETO: Soma de (J + K) apenas para NF/FT
-                    (
+                    fin AS (
                         SELECT ABS(COALESCE(SUM(COALESCE(tit_vencidos_valor_nominal,0) 
-                                                    + COALESCE(titulos_a_vencer_valor_nominal,0)), 0))
+                                                + COALESCE(titulos_a_vencer_valor_nominal,0)), 0)) as total
                         FROM {self.settings.TABLE_FINANCEIRO}
                         WHERE excluido = 0
                         AND UPPER(tipo_titulo) IN ('NF','FT')
-                    ) as total_financeiro,
-
+                    ),
                     -- Total Contábil CORRETO: Usando CONTAS_ITENS em vez de MODELO1
-                    (
-                        SELECT COALESCE(SUM(ci.saldo_atual), 0)
+                    con AS (
+                        SELECT COALESCE(SUM(ci.saldo_atual), 0) as total
                         FROM {self.settings.TABLE_CONTAS_ITENS} ci
                         WHERE ci.conta_contabil LIKE '2.01.02.01.0001%'
-                    ) as total_contabil,
-
-                    -- Diferença CORRETA
-                    (
-                    (SELECT ABS(COALESCE(SUM(COALESCE(tit_vencidos_valor_nominal,0) 
-                                                    + COALESCE(titulos_a_vencer_valor_nominal,0)), 0))
-                        FROM {self.settings.TABLE_FINANCEIRO}
-                        WHERE excluido = 0
-                        AND UPPER(tipo_titulo) IN ('NF','FT'))
-                        -
-                        ABS((SELECT COALESCE(SUM(ci.saldo_atual), 0)
-                        FROM {self.settings.TABLE_CONTAS_ITENS} ci
-                        WHERE ci.conta_contabil LIKE '2.01.02.01.0001%'))
-                    ) as diferenca_geral,
-
-                    -- Total de divergência
-                    SUM(CASE WHEN status = 'Divergente' THEN diferenca ELSE 0 END) as total_divergencia
-
-                FROM 
-                    {self.settings.TABLE_RESULTADO}
+                    ),
+                    r AS (
+                        SELECT 
+                            COUNT(*) as total_registros,
+                            SUM(CASE WHEN status = 'Conferido' THEN 1 ELSE 0 END) as conciliados_ok,
+                            SUM(CASE WHEN status = 'Divergente' THEN 1 ELSE 0 END) as divergentes,
+                            SUM(CASE WHEN status = 'Pendente' THEN 1 ELSE 0 END) as pendentes,
+                            -- Total de divergência
+                            SUM(CASE WHEN status = 'Divergente' THEN diferenca ELSE 0 END) as total_divergencia
+                        FROM {self.settings.TABLE_RESULTADO}
+                    )
+                SELECT 
+                    r.total_registros,
+                    r.conciliados_ok,
+                    r.divergentes,
+                    r.pendentes,
+                    fin.total as total_financeiro,
+                    con.total as total_contabil,
+                    -- Diferença CORRETA (reaproveita os totais já calculados)
+                    (fin.total - ABS(con.total)) as diferenca_geral,
+                    r.total_divergencia
+                FROM r, fin, con
             """
 
-            stats = pd.read_sql(query_stats, self.conn).iloc[0]
+            stats = self._consultar_linha(query_stats)
 
-            # ABA: "Fornecedores Nacionais" (Dados Financeiros) - APENAS PARA FORNECEDORES
+            # DataFrames das abas de dados, reaproveitados na formatação
+            dataframes_abas = {}
+
+            # ABAS: "Fornecedores Nacionais" (NF/FT) e "Adiantamento de Fornecedores Nacionais" (NDF/PA)
+            # As consultas são independentes entre si, então são lidas em paralelo
+            abas_financeiro = []
             if export_type in ["all", "fornecedores"]:
-                query_financeiro = f"""
+                abas_financeiro.append(('Fornecedores Nacionais', "('NF','FT')", "Total de registros financeiros"))
+            if export_type in ["all", "adiantamentos"]:
+                abas_financeiro.append(('Adiantamento de Fornecedores Nacionais', "('NDF', 'PA')", "Total de registros financeiros de adiantamento"))
+
+            consultas_financeiro = {
+                aba: f"""
                     SELECT 
-                        fornecedor as "Fornecedor",
+                        extrair_codigo(fornecedor) as "Código",
+                        extrair_descricao(fornecedor) as "Descrição Fornecedor",
                         titulo as "Título",
                         parcela as "Parcela",
                         tipo_titulo as "Tipo Título",
+                        -- Datas já saem no formato DD/MM/YYYY (gravadas assim ou em ISO)
                         CASE 
-                            WHEN data_emissao IS NULL OR data_emissao = '' THEN NULL
-                            ELSE data_emissao 
+                            WHEN data_emissao GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]' THEN data_emissao
+                            WHEN data_emissao GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' THEN strftime('%d/%m/%Y', data_emissao)
+                            ELSE NULL
                         END as "Data Emissão",
                         CASE 
-                            WHEN data_vencimento IS NULL OR data_vencimento = '' THEN NULL
-                            ELSE data_vencimento 
+                            WHEN data_vencimento GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]' THEN data_vencimento
+                            WHEN data_vencimento GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' THEN strftime('%d/%m/%Y', data_vencimento)
+                            ELSE NULL
                         END as "Data Vencimento",
                         valor_original as "Valor Original",
                         tit_vencidos_valor_nominal as "Títulos Vencidos",  -- NOVA COLUNA J
@@ -1789,76 +2193,17 @@ class DatabaseManager:
                         {self.settings.TABLE_FINANCEIRO}
                     WHERE 
                         excluido = 0
-                        AND UPPER(tipo_titulo) IN ('NF','FT')
+                        AND UPPER(tipo_titulo) IN {tipos}
                     ORDER BY 
                         fornecedor, titulo, parcela
                 """
-                df_financeiro = pd.read_sql(query_financeiro, self.conn)
-                
-                # APLICAR SEPARAÇÃO DE CÓDIGO E DESCRIÇÃO
-                df_financeiro = self.separar_codigo_descricao(df_financeiro, "Fornecedor", "Código", "Descrição Fornecedor")
-                
-                # Reorganizar colunas para ter Código e Descrição primeiro
-                colunas_ordenadas = ["Código", "Descrição Fornecedor"] + [col for col in df_financeiro.columns if col not in ["Código", "Descrição Fornecedor", "Fornecedor"]]
-                df_financeiro = df_financeiro[colunas_ordenadas]
-
-                # Verifica se há problemas com as datas
-                logger.info(f"Total de registros financeiros: {len(df_financeiro)}")
-                df_financeiro['Data Emissão'] = pd.to_datetime(df_financeiro['Data Emissão'], errors='coerce').dt.strftime('%d/%m/%Y')
-                df_financeiro['Data Vencimento'] = pd.to_datetime(df_financeiro['Data Vencimento'], errors='coerce').dt.strftime('%d/%m/%Y')
-
-                df_financeiro.to_excel(writer, sheet_name='Fornecedores Nacionais', index=False)
-
-            # ABA: "Adiantamento de Fornecedores Nacionais" (Dados Financeiros) - APENAS PARA ADIANTAMENTOS
-            if export_type in ["all", "adiantamentos"]:
-                query_adi_financeiro = f"""
-                    SELECT 
-                        fornecedor as "Fornecedor",
-                        titulo as "Título",
-                        parcela as "Parcela",
-                        tipo_titulo as "Tipo Título",
-                        CASE 
-                            WHEN data_emissao IS NULL OR data_emissao = '' THEN NULL
-                            ELSE data_emissao 
-                        END as "Data Emissão",
-                        CASE 
-                            WHEN data_vencimento IS NULL OR data_vencimento = '' THEN NULL
-                            ELSE data_vencimento 
-                        END as "Data Vencimento",
-                        valor_original as "Valor Original",
-                        tit_vencidos_valor_nominal as "Títulos Vencidos",
-                        titulos_a_vencer_valor_nominal as "Títulos a Vencer",
-                        (COALESCE(tit_vencidos_valor_nominal, 0) + COALESCE(titulos_a_vencer_valor_nominal, 0)) as "Saldo Devedor",  -- CALCULADO
-                        situacao as "Situação",
-                        conta_contabil as "Conta Contábil",
-                        centro_custo as "Centro Custo"
-                    FROM 
-                        {self.settings.TABLE_FINANCEIRO}
-                    WHERE 
-                        excluido = 0
-                        AND UPPER(tipo_titulo) IN ('NDF', 'PA')
-                    ORDER BY 
-                        fornecedor, titulo, parcela
-                """
-                df_adi_financeiro = pd.read_sql(query_adi_financeiro, self.conn)
-                
-                # APLICAR SEPARAÇÃO DE CÓDIGO E DESCRIÇÃO
-                df_adi_financeiro = self.separar_codigo_descricao(df_adi_financeiro, "Fornecedor", "Código", "Descrição Fornecedor")
-                
-                # Reorganizar colunas
-                colunas_ordenadas = ["Código", "Descrição Fornecedor"] + [col for col in df_adi_financeiro.columns if col not in ["Código", "Descrição Fornecedor", "Fornecedor"]]
-                df_adi_financeiro = df_adi_financeiro[colunas_ordenadas]
-                
-                # Verifica se há problemas com as datas
-                logger.info(f"Total de registros financeiros de adiantamento: {len(df_adi_financeiro)}")
-                df_adi_financeiro['Data Emissão'] = pd.to_datetime(df_adi_financeiro['Data Emissão'], errors='coerce').dt.strftime('%d/%m/%Y')
-                df_adi_financeiro['Data Vencimento'] = pd.to_datetime(df_adi_financeiro['Data Vencimento'], errors='coerce').dt.strftime('%d/%m/%Y')
-
-                df_adi_financeiro.to_excel(writer, sheet_name='Adiantamento de Fornecedores Nacionais', index=False)
+                for aba, tipos, _ in abas_financeiro
+            }
 
-            # ABA: "Balancete" (Dados Contábeis) - APENAS PARA FORNECEDORES
+            # Consultas das demais abas; todas são independentes e lidas em paralelo
+            consultas_abas = dict(consultas_financeiro)
             if export_type in ["all", "fornecedores"]:
-                query_contabil = f"""
+                consultas_abas['Balancete'] = f"""
                     SELECT 
                         conta_contabil as "Conta Contábil",
                         descricao_conta as "Descrição",
@@ -1880,23 +2225,7 @@ class DatabaseManager:
                         conta_contabil, 
                         codigo_fornecedor
                 """
-                df_contabil = pd.read_sql(query_contabil, self.conn)
-
-                # Remove a coluna 'ordem' apenas se ela existir
-                if 'ordem' in df_contabil.columns:
-                    df_contabil.drop(columns=["ordem"], inplace=True)
-
-                # Aplica formatação monetária nas colunas numéricas
-                monetary_columns = ['Saldo anterior', 'Debito', 'Credito', 'Saldo atual']
-                for col in monetary_columns:
-                    if col in df_contabil.columns:
-                        df_contabil[col] = df_contabil[col].apply(self.formatar_credito)
-
-                df_contabil.to_excel(writer, sheet_name='Balancete', index=False)
-                
-            # ABA: "Adiantamento" (Dados de Adiantamentos) - APENAS PARA ADIANTAMENTOS
-            if export_type in ["all", "adiantamentos"]:
-                query_adiantamento = f"""
+                consultas_abas['Contas x Itens'] = f"""
                     SELECT 
                         conta_contabil as "Conta Contábil",
                         descricao_item as "Descrição Item",
@@ -1905,32 +2234,37 @@ class DatabaseManager:
                         saldo_anterior as "Saldo Anterior",
                         saldo_atual as "Saldo Atual"
                     FROM 
-                        {self.settings.TABLE_ADIANTAMENTO}
+                        {self.settings.TABLE_CONTAS_ITENS}
                     WHERE 
-                        -- FILTRO: Remove linhas vazias/inválidas (MESMO FILTRO DA CONTAS X ITENS)
+                        -- FILTRO: Remove linhas vazias/inválidas
                         (descricao_fornecedor IS NOT NULL AND descricao_fornecedor != '')
                         AND (saldo_anterior IS NOT NULL AND saldo_anterior != 0)
                         AND (saldo_atual IS NOT NULL AND saldo_atual != 0)
                     ORDER BY 
                         conta_contabil, codigo_fornecedor
                 """
-                df_adiantamento = pd.read_sql(query_adiantamento, self.conn)
-                
-                # APLICAR SEPARAÇÃO SE NECESSÁRIO
-                if "Código Fornecedor" in df_adiantamento.columns:
-                    df_adiantamento = self.separar_codigo_descricao(df_adiantamento, "Código Fornecedor", "Código", "Descrição Fornecedor")
-                    
-                    # Reorganizar colunas se a separação foi aplicada
-                    if "Código" in df_adiantamento.columns and "Descrição Fornecedor" in df_adiantamento.columns:
-                        colunas_ordenadas = ["Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor"] + \
-                                        [col for col in df_adiantamento.columns if col not in ["Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor", "Código Fornecedor"]]
-                        df_adiantamento = df_adiantamento[colunas_ordenadas]
-                
-                df_adiantamento.to_excel(writer, sheet_name='Adiantamento', index=False)
-                
-            # ABA: "Contas x Itens" (Detalhamento Contábil) - APENAS PARA FORNECEDORES
-            if export_type in ["all", "fornecedores"]:
-                query_contas_itens = f"""
+                consultas_abas['Resumo da Conciliação'] = f"""
+                    SELECT 
+                        codigo_fornecedor as "Código Fornecedor",
+                        descricao_fornecedor as "Descrição Fornecedor",
+                        saldo_financeiro as "Total Financeiro",
+                        saldo_contabil as "Total Contábil",
+                        diferenca as "Diferença",
+                        status as "Status",
+                        detalhes as "Detalhes"
+                    FROM 
+                        {self.settings.TABLE_RESULTADO}
+                    WHERE 
+                        -- FILTRO DIRETO NO SQL: Remove registros com código vazio
+                        codigo_fornecedor IS NOT NULL 
+                        AND codigo_fornecedor != ''
+                        AND TRIM(codigo_fornecedor) != ''
+                    ORDER BY 
+                        ABS(diferenca) DESC,
+                        codigo_fornecedor
+                """
+            if export_type in ["all", "adiantamentos"]:
+                consultas_abas['Adiantamento'] = f"""
                     SELECT 
                         conta_contabil as "Conta Contábil",
                         descricao_item as "Descrição Item",
@@ -1939,32 +2273,16 @@ class DatabaseManager:
                         saldo_anterior as "Saldo Anterior",
                         saldo_atual as "Saldo Atual"
                     FROM 
-                        {self.settings.TABLE_CONTAS_ITENS}
+                        {self.settings.TABLE_ADIANTAMENTO}
                     WHERE 
-                        -- FILTRO: Remove linhas vazias/inválidas
+                        -- FILTRO: Remove linhas vazias/inválidas (MESMO FILTRO DA CONTAS X ITENS)
                         (descricao_fornecedor IS NOT NULL AND descricao_fornecedor != '')
                         AND (saldo_anterior IS NOT NULL AND saldo_anterior != 0)
                         AND (saldo_atual IS NOT NULL AND saldo_atual != 0)
                     ORDER BY 
                         conta_contabil, codigo_fornecedor
                 """
-                df_contas_itens = pd.read_sql(query_contas_itens, self.conn)
-                
-                # APLICAR SEPARAÇÃO SE NECESSÁRIO
-                if "Código Fornecedor" in df_contas_itens.columns:
-                    df_contas_itens = self.separar_codigo_descricao(df_contas_itens, "Código Fornecedor", "Código", "Descrição Fornecedor")
-                    
-                    # Reorganizar colunas se a separação foi aplicada
-                    if "Código" in df_contas_itens.columns and "Descrição Fornecedor" in df_contas_itens.columns:
-                        colunas_ordenadas = ["Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor"] + \
-                                        [col for col in df_contas_itens.columns if col not in ["Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor", "Código Fornecedor"]]
-                        df_contas_itens = df_contas_itens[colunas_ordenadas]
-                
-                df_contas_itens.to_excel(writer, sheet_name='Contas x Itens', index=False)
-
-            # ABA: "Resumo Adiantamentos" - APENAS PARA ADIANTAMENTOS
-            if export_type in ["all", "adiantamentos"]:
-                query_resumo_adiantamento = f"""
+                consultas_abas['Resumo Adiantamentos'] = f"""
                     SELECT 
                         codigo_fornecedor as "Código Fornecedor",
                         descricao_fornecedor as "Descrição Fornecedor",
@@ -1984,41 +2302,80 @@ class DatabaseManager:
                         ABS(diferenca) DESC,
                         codigo_fornecedor
                 """
-                df_resumo_adiantamento = pd.read_sql(query_resumo_adiantamento, self.conn)
+
+            # Lê todas as abas de uma vez; nas financeiras, código e descrição
+            # já chegam separados (e na ordem final) pela consulta
+            # Totais do resumo já chegam como float, sem inferência nem conversão posterior
+            tipos_resumo = {col: 'float64' for col in ("Total Financeiro", "Total Contábil", "Diferença")}
+            dfs_abas = self._ler_consultas_paralelo(
+                consultas_abas, {'Resumo da Conciliação': tipos_resumo}
+            )
+
+            for aba, _, mensagem in abas_financeiro:
+                df_aba = dfs_abas[aba]
+
+                logger.info(f"{mensagem}: {len(df_aba)}")
+                df_aba.to_excel(writer, sheet_name=aba, index=False)
+                dataframes_abas[aba] = df_aba
+
+            # ABA: "Balancete" (Dados Contábeis) - APENAS PARA FORNECEDORES
+            if export_type in ["all", "fornecedores"]:
+                # As colunas são as enumeradas no SELECT e os valores já chegam numéricos;
+                # o formato monetário das colunas é aplicado pelo estilo (ver MONETARY_HEADERS)
+                df_contabil = dfs_abas['Balancete']
+                df_contabil.to_excel(writer, sheet_name='Balancete', index=False)
+                dataframes_abas['Balancete'] = df_contabil
                 
-                # MESMO TRATAMENTO ROBUSTO PARA ADIANTAMENTOS
-                antes = len(df_resumo_adiantamento)
-                df_resumo_adiantamento = df_resumo_adiantamento[
-                    df_resumo_adiantamento["Código Fornecedor"].notna() & 
-                    (df_resumo_adiantamento["Código Fornecedor"].astype(str).str.strip() != "") &
-                    (df_resumo_adiantamento["Código Fornecedor"].astype(str).str.strip() != "None") &
-                    (df_resumo_adiantamento["Código Fornecedor"].astype(str).str.strip() != "nan")
-                ]
-                depois = len(df_resumo_adiantamento)
+            # ABA: "Adiantamento" (Dados de Adiantamentos) - APENAS PARA ADIANTAMENTOS
+            if export_type in ["all", "adiantamentos"]:
+                df_adiantamento = dfs_abas['Adiantamento']
+                
+                # APLICAR SEPARAÇÃO SE NECESSÁRIO
+                if "Código Fornecedor" in df_adiantamento.columns:
+                    df_adiantamento = self.separar_codigo_descricao(df_adiantamento, "Código Fornecedor", "Código", "Descrição Fornecedor")
+                    
+                    # Reorganizar colunas se a separação foi aplicada
+                    if "Código" in df_adiantamento.columns and "Descrição Fornecedor" in df_adiantamento.columns:
+                        df_adiantamento = self._reordenar_colunas(df_adiantamento, ("Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor"))
+                
+                df_adiantamento.to_excel(writer, sheet_name='Adiantamento', index=False)
+                dataframes_abas['Adiantamento'] = df_adiantamento
+                
+            # ABA: "Contas x Itens" (Detalhamento Contábil) - APENAS PARA FORNECEDORES
+            if export_type in ["all", "fornecedores"]:
+                df_contas_itens = dfs_abas['Contas x Itens']
+                
+                # APLICAR SEPARAÇÃO SE NECESSÁRIO
+                if "Código Fornecedor" in df_contas_itens.columns:
+                    df_contas_itens = self.separar_codigo_descricao(df_contas_itens, "Código Fornecedor", "Código", "Descrição Fornecedor")
+                    
+                    # Reorganizar colunas se a separação foi aplicada
+                    if "Código" in df_contas_itens.columns and "Descrição Fornecedor" in df_contas_itens.columns:
+                        df_contas_itens = self._reordenar_colunas(df_contas_itens, ("Conta Contábil", "Descrição Item", "Código", "Descrição Fornecedor"))
                 
-                if antes > depois:
-                    logger.warning(f"Removidas {antes - depois} linhas com código vazio do resumo de adiantamentos")
+                df_contas_itens.to_excel(writer, sheet_name='Contas x Itens', index=False)
+                dataframes_abas['Contas x Itens'] = df_contas_itens
+
+            # ABA: "Resumo Adiantamentos" - APENAS PARA ADIANTAMENTOS
+            if export_type in ["all", "adiantamentos"]:
+                df_resumo_adiantamento = dfs_abas['Resumo Adiantamentos']
                 
                 # APLICAR SEPARAÇÃO SE A COLUNA CÓDIGO FORNECEDOR CONTÉM CÓDIGO-DESCRIÇÃO
                 if "Código Fornecedor" in df_resumo_adiantamento.columns and len(df_resumo_adiantamento) > 0:
-                    df_resumo_adiantamento = self.separar_codigo_descricao(df_resumo_adiantamento, "Código Fornecedor", "Código", "Descrição Fornecedor")
+                    df_resumo_adiantamento, codigo_extraido = self.separar_codigo_descricao(
+                        df_resumo_adiantamento, "Código Fornecedor", "Código", "Descrição Fornecedor", com_mascara=True
+                    )
                     
                     # FILTRO EXTRA APÓS SEPARAÇÃO
                     antes_sep = len(df_resumo_adiantamento)
-                    df_resumo_adiantamento = df_resumo_adiantamento[
-                        df_resumo_adiantamento["Código"].notna() & 
-                        (df_resumo_adiantamento["Código"].astype(str).str.strip() != "") &
-                        (df_resumo_adiantamento["Código"].astype(str).str.strip() != "None") &
-                        (df_resumo_adiantamento["Código"].astype(str).str.strip() != "nan")
-                    ]
+                    df_resumo_adiantamento = df_resumo_adiantamento[codigo_extraido]
                     depois_sep = len(df_resumo_adiantamento)
                     
                     if antes_sep > depois_sep:
                         logger.warning(f"Removidas {antes_sep - depois_sep} linhas com código vazio após separação (adiantamentos)")
                     
                     # Reorganizar colunas
-                    colunas_ordenadas = ["Código", "Descrição Fornecedor"] + [col for col in df_resumo_adiantamento.columns if col not in ["Código", "Descrição Fornecedor", "Código Fornecedor"]]
-                    df_resumo_adiantamento = df_resumo_adiantamento[colunas_ordenadas]
+                    df_resumo_adiantamento = self._reordenar_colunas(df_resumo_adiantamento, ("Código", "Descrição Fornecedor"))
                 
                 if len(df_resumo_adiantamento) > 0:
                     df_resumo_adiantamento.to_excel(writer, sheet_name='Resumo Adiantamentos', index=False)
@@ -2027,76 +2384,39 @@ class DatabaseManager:
                     df_resumo_adiantamento = pd.DataFrame(columns=colunas)
                     df_resumo_adiantamento.to_excel(writer, sheet_name='Resumo Adiantamentos', index=False)
                     logger.warning("Resumo Adiantamentos está vazio - criando planilha vazia")
+                
+                estilos_resumo_adiantamento = self._calcular_estilos_linhas(df_resumo_adiantamento)
 
             # ABA: "Resumo da Conciliação" (Principal) - APENAS PARA FORNECEDORES
             if export_type in ["all", "fornecedores"]:
-                query_resumo = f"""
-                    SELECT 
-                        codigo_fornecedor as "Código Fornecedor",
-                        descricao_fornecedor as "Descrição Fornecedor",
-                        saldo_financeiro as "Total Financeiro",
-                        saldo_contabil as "Total Contábil",
-                        diferenca as "Diferença",
-                        status as "Status",
-                        detalhes as "Detalhes"
-                    FROM 
-                        {self.settings.TABLE_RESULTADO}
-                    WHERE 
-                        -- FILTRO DIRETO NO SQL: Remove registros com código vazio
-                        codigo_fornecedor IS NOT NULL 
-                        AND codigo_fornecedor != ''
-                        AND TRIM(codigo_fornecedor) != ''
-                    ORDER BY 
-                        ABS(diferenca) DESC,
-                        codigo_fornecedor
-                """
-                df_resumo = pd.read_sql(query_resumo, self.conn)
+                df_resumo = dfs_abas['Resumo da Conciliação']
                 
                 # LOG DETALHADO PARA DEBUG
                 logger.info(f"Total de registros no resumo após filtro SQL: {len(df_resumo)}")
                 
-                # VERIFICAÇÃO EXTRA: Remove qualquer linha que ainda possa ter código vazio
-                antes = len(df_resumo)
-                df_resumo = df_resumo[
-                    df_resumo["Código Fornecedor"].notna() & 
-                    (df_resumo["Código Fornecedor"].astype(str).str.strip() != "") &
-                    (df_resumo["Código Fornecedor"].astype(str).str.strip() != "None") &
-                    (df_resumo["Código Fornecedor"].astype(str).str.strip() != "nan")
-                ]
-                depois = len(df_resumo)
-                
-                if antes > depois:
-                    logger.warning(f"Removidas {antes - depois} linhas com código vazio após filtro extra")
-                
                 # LOG DOS PRIMEIROS REGISTROS PARA VERIFICAÇÃO
                 if len(df_resumo) > 0:
                     logger.info(f"Primeiros 5 códigos no resumo: {df_resumo['Código Fornecedor'].head().tolist()}")
                 
                 # APLICAR SEPARAÇÃO SE A COLUNA CÓDIGO FORNECEDOR CONTÉM CÓDIGO-DESCRIÇÃO
                 if "Código Fornecedor" in df_resumo.columns and len(df_resumo) > 0:
-                    df_resumo = self.separar_codigo_descricao(df_resumo, "Código Fornecedor", "Código", "Descrição Fornecedor")
+                    df_resumo, codigo_extraido = self.separar_codigo_descricao(
+                        df_resumo, "Código Fornecedor", "Código", "Descrição Fornecedor", com_mascara=True
+                    )
                     
                     # FILTRO EXTRA APÓS SEPARAÇÃO: Remove linhas onde o código ficou vazio após separação
                     antes_sep = len(df_resumo)
-                    df_resumo = df_resumo[
-                        df_resumo["Código"].notna() & 
-                        (df_resumo["Código"].astype(str).str.strip() != "") &
-                        (df_resumo["Código"].astype(str).str.strip() != "None") &
-                        (df_resumo["Código"].astype(str).str.strip() != "nan")
-                    ]
+                    df_resumo = df_resumo[codigo_extraido]
                     depois_sep = len(df_resumo)
                     
                     if antes_sep > depois_sep:
                         logger.warning(f"Removidas {antes_sep - depois_sep} linhas com código vazio após separação")
                     
                     # Reorganizar colunas
-                    colunas_ordenadas = ["Código", "Descrição Fornecedor"] + [col for col in df_resumo.columns if col not in ["Código", "Descrição Fornecedor", "Código Fornecedor"]]
-                    df_resumo = df_resumo[colunas_ordenadas]
+                    df_resumo = self._reordenar_colunas(df_resumo, ("Código", "Descrição Fornecedor"))
 
-                # Garantir que as colunas sejam float antes de exportar
-                for col in ["Total Financeiro", "Total Contábil", "Diferença"]:
-                    if col in df_resumo.columns:
-                        df_resumo[col] = pd.to_numeric(df_resumo[col], errors="coerce").fillna(0)
+                # Colunas já lidas como float; só os nulos viram zero antes de exportar
+                df_resumo[list(tipos_resumo)] = df_resumo[list(tipos_resumo)].fillna(0.0)
 
                 # LOG FINAL ANTES DE EXPORTAR
                 logger.info(f"Total final de registros no resumo: {len(df_resumo)}")
@@ -2109,6 +2429,8 @@ class DatabaseManager:
                     df_resumo = pd.DataFrame(columns=colunas)
                     df_resumo.to_excel(writer, sheet_name='Resumo da Conciliação', index=False)
                     logger.warning("Resumo da Conciliação está vazio - criando planilha vazia")
+                
+                estilos_resumo = self._calcular_estilos_linhas(df_resumo)
 
             # Query para estatísticas de adiantamentos
             query_adiantamento_stats = f"""
@@ -2126,162 +2448,53 @@ class DatabaseManager:
                     {self.settings.TABLE_RESULTADO_ADIANTAMENTO}
             """
 
-            adiantamento_stats = pd.read_sql(query_adiantamento_stats, self.conn).iloc[0]
+            adiantamento_stats = self._consultar_linha(query_adiantamento_stats)
 
             # Cria aba de Metadados específica para cada tipo
-            if export_type == "fornecedores":
-                metadata_items = [
-                    'Data e Hora do Processamento',
-                    'Período de Referência',
-                    'Total de Fornecedores Processados',
-                    'Conciliações Conferidas',
-                    'Conciliações Divergentes',
-                    'Conciliações Pendentes',
-                    'Total Financeiro (R$)', 
-                    'Total Contábil (R$)',
-                    'Diferença Total (R$)',
-                    '--- CONFIGURAÇÕES ---',
-                    'Legenda de Status',
-                    'Tolerância de Diferença'
-                ]
-
-                metadata_values = [
-                    datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
-                    f'{data_inicial} a {data_final}',
-                    int(stats['total_registros']),
-                    int(stats['conciliados_ok']),
-                    int(stats['divergentes']),
-                    int(stats['pendentes']),
-                    f"R$ {stats['total_financeiro']:,.2f}",
-                    f"R$ {stats['total_contabil']:,.2f}",
-                    f"R$ {stats['diferenca_geral']:,.2f}",
-                    '---',
-                    'CONFERIDO: Diferença dentro da tolerância (até 3%) | DIVERGENTE: Diferença significativa | PENDENTE: Sem correspondência',
-                    'Até 3% de discrepância é considerada tolerável'
-                ]
-                
-            elif export_type == "adiantamentos":
-                metadata_items = [
-                    'Data e Hora do Processamento',
-                    'Período de Referência',
-                    'Total de Adiantamentos Processados',
-                    'Adiantamentos Conferidos',
-                    'Adiantamentos Divergentes',
-                    'Adiantamentos Pendentes',
-                    'Total Financeiro Adiantamentos (R$)',
-                    'Total Contábil Adiantamentos (R$)',
-                    'Diferença Total Adiantamentos (R$)',
-                    '--- CONFIGURAÇÕES ---',
-                    'Legenda de Status',
-                    'Tolerância de Diferença'
-                ]
-
-                metadata_values = [
-                    datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
-                    f'{data_inicial} a {data_final}',
-                    int(adiantamento_stats['total_adiantamentos']),
-                    int(adiantamento_stats['adiantamentos_ok']),
-                    int(adiantamento_stats['adiantamentos_divergentes']),
-                    int(adiantamento_stats['adiantamentos_pendentes']),
-                    f"R$ {adiantamento_stats['total_financeiro_adiantamento']:,.2f}",
-                    f"R$ {adiantamento_stats['total_contabil_adiantamento']:,.2f}",
-                    f"R$ {adiantamento_stats['diferenca_adiantamento']:,.2f}",
-                    '---',
-                    'CONFERIDO: Diferença dentro da tolerância (até 3%) | DIVERGENTE: Diferença significativa | PENDENTE: Sem correspondência',
-                    'Até 3% de discrepância é considerada tolerável'
-                ]
-                
-            else:  # all
-                metadata_items = [
-                    'Data e Hora do Processamento',
-                    'Período de Referência',
-                    'Total de Fornecedores Processados',
-                    'Conciliações Conferidas',
-                    'Conciliações Divergentes',
-                    'Conciliações Pendentes',
-                    'Total Financeiro (R$)',
-                    'Total Contábil (R$)',
-                    'Diferença Total (R$)',
-                    '--- ADIANTAMENTOS ---',
-                    'Total de Adiantamentos Processados',
-                    'Adiantamentos Divergentes', 
-                    'Total Financeiro Adiantamentos (R$)',
-                    'Total Contábil Adiantamentos (R$)',
-                    'Saldo Líquido Adiantamentos (R$)',
-                    '--- CONFIGURAÇÕES ---',
-                    'Legenda de Status',
-                    'Tolerância de Diferença'
-                ]
-
-                metadata_values = [
-                    datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
-                    f'{data_inicial} a {data_final}',
-                    int(stats['total_registros']),
-                    int(stats['conciliados_ok']),
-                    int(stats['divergentes']),
-                    int(stats['pendentes']),
-                    f"R$ {stats['total_financeiro']:,.2f}",
-                    f"R$ {stats['total_contabil']:,.2f}",
-                    f"R$ {stats['diferenca_geral']:,.2f}",
-                    '---',
-                    int(adiantamento_stats['total_adiantamentos']),
-                    int(adiantamento_stats['adiantamentos_divergentes']),
-                    f"R$ {adiantamento_stats['total_financeiro_adiantamento']:,.2f}",
-                    f"R$ {adiantamento_stats['total_contabil_adiantamento']:,.2f}",
-                    f"R$ {adiantamento_stats['diferenca_adiantamento']:,.2f}",
-                    '---',
-                    'CONFERIDO: Diferença dentro da tolerância (até 3%) | DIVERGENTE: Diferença significativa | PENDENTE: Sem correspondência',
-                    'Até 3% de discrepância é considerada tolerável'
-                ]
-
-            # VERIFICAÇÃO DE COMPRIMENTO
-            if len(metadata_items) != len(metadata_values):
-                logger.error(f"Metadados incompatíveis: {len(metadata_items)} itens vs {len(metadata_values)} valores")
-                min_length = min(len(metadata_items), len(metadata_values))
-                metadata_items = metadata_items[:min_length]
-                metadata_values = metadata_values[:min_length]
-                
-            metadata = {
-                'Item': metadata_items,
-                'Valor': metadata_values
+            contexto = {
+                'stats': stats,
+                'adiantamento': adiantamento_stats,
+                'gerado_em': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+                'periodo': f"{data_inicial} a {data_final}",
             }
+            schema = METADATA_SCHEMA.get(export_type, METADATA_SCHEMA['all'])
+            metadata = tuple((item, valor(contexto)) for item, valor in schema)
+            df_metadata = pd.DataFrame(metadata, columns=['Item', 'Valor'])
 
-            df_metadata = pd.DataFrame(metadata)
             df_metadata.to_excel(writer, sheet_name='Metadados', index=False)
-            writer.close()
             
-            # Aplica estilos ao arquivo gerado
-            workbook = openpyxl.load_workbook(output_path)
+            # Aplica estilos direto no workbook em memória do writer, evitando
+            # salvar, reabrir e salvar novamente o arquivo inteiro
+            workbook = writer.book
+            
+            # Registra os estilos nomeados uma única vez antes da formatação em lote
+            self._registrar_estilos_planilha(workbook)
             
-            # Aplica estilos à aba Metadados
-            if "Metadados" in workbook.sheetnames:
-                meta_sheet = workbook["Metadados"]
-                for row_idx, (item, value) in enumerate(zip(metadata_items, metadata_values), 1):
-                    meta_sheet.cell(row=row_idx, column=1, value=item)
-                    meta_sheet.cell(row=row_idx, column=2, value=value)
-                self._apply_metadata_styles(meta_sheet, metadata_items, metadata_values)
+            # Aplica estilos à aba Metadados (os valores já foram gravados pelo to_excel)
+            if "Metadados" in writer.sheets:
+                self._apply_metadata_styles(writer.sheets["Metadados"], metadata)
             
             # Aplica estilos melhorados às abas principais
             if export_type in ["all", "fornecedores"] and 'Resumo da Conciliação' in workbook.sheetnames:
                 resumo_sheet = workbook['Resumo da Conciliação']
-                self._apply_enhanced_styles(resumo_sheet, stats)
+                self._apply_enhanced_styles(resumo_sheet, stats, estilos_resumo)
                 resumo_sheet.auto_filter.ref = resumo_sheet.dimensions
                 
             if export_type in ["all", "adiantamentos"] and 'Resumo Adiantamentos' in workbook.sheetnames:
                 adiantamento_sheet = workbook['Resumo Adiantamentos']
-                self._apply_enhanced_styles(adiantamento_sheet, adiantamento_stats)
+                self._apply_enhanced_styles(adiantamento_sheet, adiantamento_stats, estilos_resumo_adiantamento)
                 adiantamento_sheet.auto_filter.ref = adiantamento_sheet.dimensions
             
             # Aplica estilos básicos às outras abas
             for sheetname in workbook.sheetnames:
                 if sheetname not in ['Resumo da Conciliação', 'Resumo Adiantamentos', 'Metadados']:
                     sheet = workbook[sheetname]
-                    self._apply_styles(sheet)
+                    self._apply_styles(sheet, dataframes_abas.get(sheetname))
             
             # Protege todas as abas
             self._protect_sheets(workbook)
             
-            workbook.save(output_path)
+            writer.close()
             
             # Valida o arquivo gerado
             if not self.validate_output(output_path, export_type):
@@ -2296,6 +2509,31 @@ class DatabaseManager:
             raise ResultsSaveError(error_msg, caminho=output_path) from e
     
 
+    def _verificar_formato_moeda(self, worksheet, monetary_columns):
+        """
+        Confere se a primeira linha de dados das colunas monetárias está formatada como moeda.
+        
+        Args:
+            worksheet: Aba aberta em modo somente leitura
+            monetary_columns: Nomes das colunas que devem estar em moeda
+        """
+        linhas = list(worksheet.iter_rows(min_row=1, max_row=2))
+        if not linhas:
+            return
+        
+        header = [cell.value for cell in linhas[0] if cell.value is not None]
+        primeira_linha = linhas[1] if len(linhas) > 1 else ()
+        
+        for col_name in monetary_columns:
+            if col_name in header:
+                col_idx = header.index(col_name)
+                if col_idx >= len(primeira_linha):
+                    continue
+                sample_cell = primeira_linha[col_idx]
+                if sample_cell.value is not None and hasattr(sample_cell, 'number_format'):
+                    if 'R$' not in sample_cell.number_format and '#,##0.00' not in sample_cell.number_format:
+                        logger.warning(f"Coluna '{col_name}' não está formatada como moeda brasileira")
+
     def validate_output(self, output_path, export_type="all"):
         """
         Valida a estrutura do arquivo Excel gerado.
@@ -2305,49 +2543,35 @@ class DatabaseManager:
             export_type: Tipo de exportação (opcional, padrão "all")
         """
         try:
-            wb = openpyxl.load_workbook(output_path)
-            
-            # Define as abas obrigatórias baseadas no tipo de exportação
-            if export_type == "fornecedores":
-                required_sheets = ['Resumo da Conciliação', 'Fornecedores Nacionais', 'Balancete', 'Contas x Itens', 'Metadados']
-            elif export_type == "adiantamentos":
-                required_sheets = ['Resumo Adiantamentos', 'Adiantamento de Fornecedores Nacionais', 'Adiantamento', 'Metadados']
-            else:
-                required_sheets = ['Resumo da Conciliação', 'Fornecedores Nacionais', 'Balancete', 'Contas x Itens', 
-                                'Resumo Adiantamentos', 'Adiantamento de Fornecedores Nacionais', 'Adiantamento', 'Metadados']
-            
-            for sheet in required_sheets:
-                if sheet not in wb.sheetnames:
-                    raise ValueError(f"Aba '{sheet}' não encontrada no arquivo gerado")
-            
-            # Verifica formatação monetária nas abas principais
-            if export_type in ["all", "fornecedores"] and 'Resumo da Conciliação' in wb.sheetnames:
-                resumo = wb['Resumo da Conciliação']
-                monetary_columns = ['Saldo Financeiro', 'Saldo Contábil', 'Diferença']
-                
-                header = [cell.value for cell in resumo[1] if cell.value is not None]
+            # Modo somente leitura: só os nomes das abas e as duas primeiras
+            # linhas dos resumos são lidos, sem materializar todas as células
+            wb = openpyxl.load_workbook(output_path, read_only=True, data_only=True)
+            try:
+                # Define as abas obrigatórias baseadas no tipo de exportação
+                if export_type == "fornecedores":
+                    required_sheets = ['Resumo da Conciliação', 'Fornecedores Nacionais', 'Balancete', 'Contas x Itens', 'Metadados']
+                elif export_type == "adiantamentos":
+                    required_sheets = ['Resumo Adiantamentos', 'Adiantamento de Fornecedores Nacionais', 'Adiantamento', 'Metadados']
+                else:
+                    required_sheets = ['Resumo da Conciliação', 'Fornecedores Nacionais', 'Balancete', 'Contas x Itens', 
+                                    'Resumo Adiantamentos', 'Adiantamento de Fornecedores Nacionais', 'Adiantamento', 'Metadados']
                 
-                for col_name in monetary_columns:
-                    if col_name in header:
-                        col_idx = header.index(col_name) + 1
-                        sample_cell = resumo.cell(row=2, column=col_idx)
-                        if sample_cell.value is not None and hasattr(sample_cell, 'number_format'):
-                            if 'R$' not in sample_cell.number_format and '#,##0.00' not in sample_cell.number_format:
-                                logger.warning(f"Coluna '{col_name}' não está formatada como moeda brasileira")
-            
-            if export_type in ["all", "adiantamentos"] and 'Resumo Adiantamentos' in wb.sheetnames:
-                adiantamento = wb['Resumo Adiantamentos']
-                monetary_columns = ['Total Financeiro', 'Total Contábil', 'Diferença']
+                for sheet in required_sheets:
+                    if sheet not in wb.sheetnames:
+                        raise ValueError(f"Aba '{sheet}' não encontrada no arquivo gerado")
                 
-                header = [cell.value for cell in adiantamento[1] if cell.value is not None]
+                # Verifica formatação monetária nas abas principais
+                if export_type in ["all", "fornecedores"] and 'Resumo da Conciliação' in wb.sheetnames:
+                    self._verificar_formato_moeda(
+                        wb['Resumo da Conciliação'], ['Saldo Financeiro', 'Saldo Contábil', 'Diferença']
+                    )
                 
-                for col_name in monetary_columns:
-                    if col_name in header:
-                        col_idx = header.index(col_name) + 1
-                        sample_cell = adiantamento.cell(row=2, column=col_idx)
-                        if sample_cell.value is not None and hasattr(sample_cell, 'number_format'):
-                            if 'R$' not in sample_cell.number_format and '#,##0.00' not in sample_cell.number_format:
-                                logger.warning(f"Coluna '{col_name}' não está formatada como moeda brasileira")
+                if export_type in ["all", "adiantamentos"] and 'Resumo Adiantamentos' in wb.sheetnames:
+                    self._verificar_formato_moeda(
+                        wb['Resumo Adiantamentos'], ['Total Financeiro', 'Total Contábil', 'Diferença']
+                    )
+            finally:
+                wb.close()
             
             return True
             
@@ -15,6 +15,7 @@ from .exceptions import (
     ExcecaoNaoMapeadaError
 )
 from .utils import Utils
+from ._locator_registry import build as build_locators, MENU_BALANCETES_RE
 from datetime import date
 from pathlib import Path
 import time
@@ -25,40 +26,50 @@ logger = configure_logger()
 class Modelo_1(Utils):
     """Classe para automação do relatório Modelo 1 (Balancete)."""
     
-    def __init__(self, page):  
+    # Campos de texto dos parâmetros: (chave no JSON e nos locators, componente na tela)
+    _CAMPOS_PARAMETROS = (
+        ('data_inicial', '#COMP4512'),
+        ('data_final', '#COMP4514'),
+        ('conta_inicial', '#COMP4516'),
+        ('conta_final', '#COMP4518'),
+        ('data_lucros_perdas', '#COMP4556'),
+        ('grupos_receitas_despesas', '#COMP4562'),
+        ('data_sid_art', '#COMP4564'),
+        ('num_linha_balancete', '#COMP4566'),
+        ('desc_moeda', '#COMP4568'),
+    )
+    
+    def __init__(self, page, settings=None):  
         """
         Inicializa a classe Modelo 1.
         
         Args:
             page: Instância da página do Playwright
+            settings: Configurações já carregadas pelo orquestrador (opcional)
         """
         self.page = page
-        self.settings = Settings() 
+        self.settings = settings or Settings() 
         self.parametros_json = 'Modelo_1'
+        # Destino do download definido (e com a pasta garantida) uma única vez
+        self._destino = Path(self.settings.CAMINHO_PLS) / self.settings.PLS_MODELO_1
+        self._destino.parent.mkdir(parents=True, exist_ok=True)
         self._definir_locators()
         logger.info("Modelo_1 inicializado")
 
     def _definir_locators(self):
         """Define todos os locators específicos do relatório Modelo 1."""
-        self.locators = {
+        # Menus e botões comuns vêm do registro compartilhado
+        self.locators = build_locators(self.page)
+        self.locators.update({
             # Elementos do menu de navegação
-            'menu_relatorios': self.page.get_by_text("Relatorios (9)"),
-            'submenu_balancetes': self.page.get_by_text("Balancetes (34)"),
+            'submenu_balancetes': self.page.get_by_text(MENU_BALANCETES_RE),
             'opcao_modelo1': self.page.get_by_text("Modelo 1", exact=True),
-            'popup_fechar': self.page.get_by_role("button", name="Fechar"),
-            'botao_confirmar': self.page.get_by_role("button", name="Confirmar"),
-            'botao_marcar_filiais': self.page.get_by_role("button", name="Marca Todos - <F4>"),
 
             # Campos de parâmetros do relatório
-            'data_inicial': self.page.locator("#COMP4512").get_by_role("textbox"),
-            'data_final': self.page.locator("#COMP4514").get_by_role("textbox"),
-            'conta_inicial': self.page.locator("#COMP4516").get_by_role("textbox"),
-            'conta_final': self.page.locator("#COMP4518").get_by_role("textbox"),
-            'data_lucros_perdas': self.page.locator("#COMP4556").get_by_role("textbox"),
-            'grupos_receitas_despesas': self.page.locator("#COMP4562").get_by_role("textbox"),
-            'data_sid_art': self.page.locator("#COMP4564").get_by_role("textbox"),
-            'num_linha_balancete': self.page.locator("#COMP4566").get_by_role("textbox"),
-            'desc_moeda': self.page.locator("#COMP4568").get_by_role("textbox"),
+            **{
+                chave: self.page.locator(seletor).get_by_role("textbox")
+                for chave, seletor in self._CAMPOS_PARAMETROS
+            },
             'selec_filiais': self.page.locator("#COMP4570").get_by_role("combobox"),
             'botao_ok': self.page.locator('button:has-text("Ok")'),
 
@@ -66,8 +77,7 @@ class Modelo_1(Utils):
             'aba_planilha': self.page.get_by_role("button", name="Planilha"),
             'formato': self.page.locator("#COMP4547").get_by_role("combobox"),
             'botao_imprimir': self.page.get_by_role("button", name="Imprimir"),
-            'botao_sim': self.page.get_by_role("button", name="Sim")
-        }
+        })
         logger.info("Seletores definidos")
 
     def _navegar_menu(self):
@@ -85,17 +95,12 @@ class Modelo_1(Utils):
             self.locators['menu_relatorios'].click()
             logger.info("Menu Relatórios clicado")
             
-            time.sleep(5)  
-            
-            # Verifica se o submenu está visível, caso contrário clica novamente
-            if not self.locators['submenu_balancetes'].is_visible():
-                self.locators['menu_relatorios'].click()
-                time.sleep(1)
+            # Aguarda o submenu; se o menu não abriu, clica novamente
+            self._aguardar_ou_repetir('submenu_balancetes', 'menu_relatorios', timeout=5000)
             
             # Acessa o submenu de balancetes
             self.locators['submenu_balancetes'].click()
             logger.info("Submenu Balancetes clicado")
-            time.sleep(1)
             
             # Seleciona a opção Modelo 1
             self.locators['opcao_modelo1'].wait_for(state="visible")
@@ -121,63 +126,16 @@ class Modelo_1(Utils):
         try:
             logger.info(f"Usando chave JSON: {self.parametros_json}")
             
-            input_data_inicial = self.parametros.get('data_inicial')
-            input_data_final = self.parametros.get('data_final')
-            
-            # Obtém outros parâmetros do JSON
-            input_conta_inicial = self.parametros.get('conta_inicial')
-            input_conta_final = self.parametros.get('conta_final')
-            input_data_lucros_perdas = self.parametros.get('data_lucros_perdas')
-            input_grupos_receitas_despesas = self.parametros.get('grupos_receitas_despesas')
-            input_data_sid_art = self.parametros.get('data_sid_art')
-            input_num_linha_balancete = self.parametros.get('num_linha_balancete')
-            input_desc_moeda = self.parametros.get('desc_moeda')
-
-            # Preenche campos de data
+            # Campos de texto preenchidos em uma única chamada ao navegador
             self.locators['data_inicial'].wait_for(state="visible")
-            self.locators['data_inicial'].click()
-            self.locators['data_inicial'].fill(input_data_inicial)
-            time.sleep(0.5) 
-            
-            self.locators['data_final'].click()
-            self.locators['data_final'].fill(input_data_final)
-            time.sleep(0.5) 
-            
-            # Preenche campos de conta
-            self.locators['conta_inicial'].click()
-            self.locators['conta_inicial'].fill(input_conta_inicial)
-            time.sleep(0.5) 
-            
-            self.locators['conta_final'].click()
-            self.locators['conta_final'].fill(input_conta_final)
-            time.sleep(0.5) 
-            
-            # Preenche campos específicos do relatório
-            self.locators['data_lucros_perdas'].click()
-            self.locators['data_lucros_perdas'].fill(input_data_lucros_perdas)
-            time.sleep(0.5) 
-            
-            self.locators['grupos_receitas_despesas'].click()
-            self.locators['grupos_receitas_despesas'].fill(input_grupos_receitas_despesas)
-            time.sleep(0.5) 
-            
-            self.locators['data_sid_art'].click()
-            self.locators['data_sid_art'].fill(input_data_sid_art)
-            time.sleep(0.5) 
-            
-            self.locators['num_linha_balancete'].click()
-            self.locators['num_linha_balancete'].fill(input_num_linha_balancete)
-            time.sleep(0.5) 
-            
-            self.locators['desc_moeda'].click()
-            self.locators['desc_moeda'].fill(input_desc_moeda)
-            time.sleep(0.5)
+            self._preencher_campos([
+                (chave, seletor, self.parametros.get(chave))
+                for chave, seletor in self._CAMPOS_PARAMETROS
+            ])
             
             # Configura seleção de filiais
             self.locators['selec_filiais'].click()
-            time.sleep(0.5)
             self.locators['selec_filiais'].select_option("0")
-            time.sleep(0.5)
             
             # Finaliza o preenchimento
             self.locators['botao_ok'].click()
@@ -197,51 +155,34 @@ class Modelo_1(Utils):
         try: 
             # Acessa a aba de planilha
             self.locators['aba_planilha'].wait_for(timeout=360000)
-            time.sleep(1) 
             self.locators['aba_planilha'].click()
-            time.sleep(1) 
             
-            # Verifica se o formulário está visível
-            if not self.locators['formato'].is_visible():
-                self.locators['aba_planilha'].click()
-                time.sleep(1)
+            # Aguarda o formulário; se não abriu, clica novamente na aba
+            self._aguardar_ou_repetir('formato', 'aba_planilha')
             
             # Seleciona o formato da planilha
             self.locators['formato'].select_option("3")
-            time.sleep(1) 
             
             # Espera pelo download com timeout aumentado
             with self.page.expect_download(timeout=360000) as download_info:
                 self.locators['botao_imprimir'].click()
                 time.sleep(2)
                 self._fechar_popup_se_existir()
-                if 'botao_sim' in self.locators and self.locators['botao_sim'].is_visible():
-                    self.locators['botao_sim'].click()
+                if self.locators['botao_sim'].is_visible():
+                    self._clicar('botao_sim')
                 
             # Processa o download
-            download = download_info.value
-            logger.info(f"Download iniciado: {download.suggested_filename}") 
-            
-            # Aguarda conclusão do download
-            download_path = download.path()
-            if download_path:
-                settings = Settings()
-                destino = Path(settings.CAMINHO_PLS) / settings.PLS_MODELO_1
-                
-                # Garante que o diretório existe
-                destino.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Salva o arquivo
-                download.save_as(destino)
-                logger.info(f"Arquivo Modelo 1 salvo em: {destino}")
+            falha = self._salvar_download(download_info.value, self._destino)
+            if falha is None:
+                logger.info(f"Arquivo Modelo 1 salvo em: {self._destino}")
             else:
-                error_msg = "Download falhou - caminho não disponível"
+                error_msg = f"Download falhou - {falha}"
                 logger.error(error_msg)
                 raise DownloadFailed(error_msg)
             
             # Verifica se há botão de confirmação adicional
-            if 'botao_sim' in self.locators and self.locators['botao_sim'].is_visible():
-                self.locators['botao_sim'].click()
+            if self.locators['botao_sim'].is_visible():
+                self._clicar('botao_sim')
                 
         except TimeoutError as e:
             error_msg = "Timeout na geração da planilha Modelo 1"
@@ -268,9 +209,7 @@ class Modelo_1(Utils):
 
             # Executa o fluxo completo
             self._navegar_menu()
-            time.sleep(1) 
             self._confirmar_operacao()
-            time.sleep(1) 
             self._fechar_popup_se_existir()
             self._preencher_parametros()
             self._selecionar_filiais()
@@ -10,7 +10,6 @@ from config.logger import configure_logger
 from .exceptions import (
     LoginProtheusError,
     BrowserClosedError,
-    DownloadFailed,
     TimeoutOperacional,
     ExcecaoNaoMapeadaError,
     FormSubmitFailed
@@ -20,8 +19,10 @@ from .financeiro import ExtracaoFinanceiro
 from .modelo_1 import Modelo_1
 from .contasxitens import Contas_x_itens
 from .database import DatabaseManager
+from collections import Counter
 from pathlib import Path
-import time
+import os
+import re
 
 
 # Usar em qualquer lugar
@@ -29,6 +30,68 @@ import time
 # Configuração do logger para registro de atividades
 logger = configure_logger()
 
+# Imagens, fontes e mídia não são usadas pela automação; as requisições são abortadas.
+# O filtro é pela URL para que só esses arquivos passem pelo handler (CSS segue liberado,
+# a visibilidade dos elementos depende dele)
+_RECURSOS_BLOQUEADOS = re.compile(r"\.(png|jpe?g|gif|svg|ico|bmp|webp|woff2?|ttf|otf|eot|mp3|mp4|webm)(\?.*)?$", re.IGNORECASE)
+
+# Preenche os campos da segunda tela de login dentro do iframe em uma única chamada.
+# Cada item é [rótulo, valor]; o campo é achado pelo aria-label ou pelo <label> associado.
+# Retorna os rótulos não encontrados, para que sejam preenchidos pelo Playwright
+_JS_PREENCHER_LOGIN = """(corpo, campos) => {
+    const faltando = [];
+    for (const [rotulo, valor] of campos) {
+        let campo = corpo.querySelector(`input[aria-label="${rotulo}"]`);
+        if (!campo) {
+            const label = [...corpo.querySelectorAll('label')].find(l => l.textContent.trim() === rotulo);
+            campo = label && label.control;
+        }
+        if (!campo) {
+            faltando.push(rotulo);
+            continue;
+        }
+        campo.focus();
+        campo.value = valor;
+        campo.dispatchEvent(new Event('input', {bubbles: true}));
+        campo.dispatchEvent(new Event('change', {bubbles: true}));
+        campo.blur();
+    }
+    return faltando;
+}"""
+
+
+def _resultado(status, mensagem, etapa, codigo_erro=None):
+    """
+    Monta o registro de resultado de uma etapa do run().
+    
+    Args:
+        status (str): 'success', 'error' ou 'critical_error'
+        mensagem (str): Descrição do resultado
+        etapa (str): Nome da etapa
+        codigo_erro: Código de erro (None em caso de sucesso)
+        
+    Returns:
+        dict: Resultado com as chaves status, message, etapa e error_code
+    """
+    return {'status': status, 'message': mensagem, 'etapa': etapa, 'error_code': codigo_erro}
+
+
+def _codigo_erro(e, padrao='FE3'):
+    """
+    Retorna o código de erro da exceção para o resultado da etapa.
+    
+    Cada exceção do projeto define seu código como atributo de classe;
+    exceções de terceiros recebem o código padrão.
+    
+    Args:
+        e: Exceção capturada
+        padrao (str): Código usado quando a exceção não define um
+        
+    Returns:
+        Código de erro da exceção ou o padrão
+    """
+    return getattr(e, 'code', padrao)
+
 class ProtheusScraper(Utils):
     """Classe principal para automação do sistema Protheus."""
     
@@ -42,9 +105,9 @@ class ProtheusScraper(Utils):
         self.settings = settings
         self.playwright = None
         self.browser = None
+        self.via_cdp = False
         self.context = None
         self.page = None
-        self.downloads = [] 
         self._initialize_resources()
         logger.info("Navegador inicializado")
 
@@ -63,9 +126,42 @@ class ProtheusScraper(Utils):
     def _setup_browser(self):
         """
         Configura o navegador Edge com as opções especificadas.
+
+        Com CDP_ENDPOINT definido, reaproveita um Edge já aberto em vez de iniciar
+        um novo processo; se a conexão falhar, abre o navegador normalmente.
+        Com EDGE_PROFILE_DIR definido, o Edge é aberto com esse perfil persistente,
+        que já devolve o contexto da execução; se o perfil estiver bloqueado,
+        abre o navegador normalmente.
         """
         try:
-            self.browser = self.playwright.chromium.launch(channel="msedge", headless=False)
+            if self.settings.CDP_ENDPOINT:
+                try:
+                    self.browser = self.playwright.chromium.connect_over_cdp(self.settings.CDP_ENDPOINT)
+                    self.via_cdp = True
+                    logger.info(f"Conectado ao navegador existente em {self.settings.CDP_ENDPOINT}")
+                    return
+                except Exception as e:
+                    logger.warning(f"Não foi possível conectar via CDP ({e}), abrindo novo navegador")
+            if self.settings.EDGE_PROFILE_DIR:
+                try:
+                    self.context = self.playwright.chromium.launch_persistent_context(
+                        self.settings.EDGE_PROFILE_DIR,
+                        channel="msedge",
+                        headless=self.settings.HEADLESS,
+                        args=self.settings.BROWSER_ARGS,
+                        no_viewport=True,
+                        accept_downloads=True
+                    )
+                    logger.info(f"Navegador aberto com o perfil {self.settings.EDGE_PROFILE_DIR}")
+                    return
+                except Exception as e:
+                    # Perfil em uso (outra execução ou Edge que sobrou de uma queda)
+                    logger.warning(f"Não foi possível abrir o perfil {self.settings.EDGE_PROFILE_DIR} ({e}), abrindo navegador sem perfil")
+            self.browser = self.playwright.chromium.launch(
+                channel="msedge",
+                headless=self.settings.HEADLESS,
+                args=self.settings.BROWSER_ARGS
+            )
         except Exception as e:
             error_msg = "Falha ao configurar o navegador"
             logger.error(f"{error_msg}: {e}")
@@ -76,56 +172,39 @@ class ProtheusScraper(Utils):
         Configura a página e contexto do navegador.
         """
         try:
-            self.context = self.browser.new_context(
-                no_viewport=True,
-                accept_downloads=True  
-            )
+            # Com perfil persistente o contexto já foi criado junto com o navegador
+            if self.context is None:
+                self.context = self.browser.new_context(
+                    no_viewport=True,
+                    accept_downloads=True  
+                )
             
-            # Monitorar eventos de download
-            self.context.on("download", self._handle_download)
+            # Downloads são aguardados por expect_download em cada relatório
+            self.context.route(_RECURSOS_BLOQUEADOS, lambda route: route.abort())
             
-            self.page = self.context.new_page()
+            # O perfil persistente abre com uma aba em branco, que é reaproveitada
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
             self.page.set_default_timeout(self.settings.TIMEOUT)
         except Exception as e:
             error_msg = "Falha ao configurar a página do navegador"
             logger.error(f"{error_msg}: {e}")
             raise BrowserClosedError(error_msg) from e
 
-    def _handle_download(self, download):
-        """
-        Manipula eventos de download - monitora mas não salva os arquivos.
-        
-        Args:
-            download: Objeto de download do Playwright
-        """
-        try:
-            # Aguardar o download ser concluído
-            download_path = download.path()
-            
-            if download_path:
-                logger.info(f"Download concluído: {download.suggested_filename}")
-                # Não salva aqui - cada classe de extração salva com seu próprio nome
-            else:
-                logger.error(f"Download falhou: {download.suggested_filename}")
-                raise DownloadFailed(f"Download falhou: {download.suggested_filename}")
-                
-        except Exception as e:
-            error_msg = f"Erro ao processar download: {e}"
-            logger.error(error_msg)
-            raise DownloadFailed(error_msg) from e
-                
     def _definir_locators(self):
         """Define todos os locators utilizados na automação."""
         try:
+            # Tela de login fica dentro do iframe; o frame_locator é criado uma vez e reaproveitado
+            frame = self.page.frame_locator("iframe")
             self.locators = {
                 'iframe': self.page.locator("iframe"),
+                'corpo_login': frame.locator("body"),
                 'botao_ok': self.page.locator('button:has-text("Ok")'),
-                'campo_usuario': self.page.frame_locator("iframe").get_by_placeholder("Ex. sp01\\nome.sobrenome"),
-                'campo_senha': self.page.frame_locator("iframe").get_by_label("Insira sua senha"),
-                'botao_entrar': self.page.frame_locator("iframe").get_by_role("button", name="Entrar"),            
-                'campo_grupo': self.page.frame_locator("iframe").get_by_label("Grupo"),
-                'campo_filial': self.page.frame_locator("iframe").get_by_label("Filial"),
-                'campo_ambiente': self.page.frame_locator("iframe").get_by_label("Ambiente"),
+                'campo_usuario': frame.get_by_placeholder("Ex. sp01\\nome.sobrenome"),
+                'campo_senha': frame.get_by_label("Insira sua senha"),
+                'botao_entrar': frame.get_by_role("button", name="Entrar"),            
+                'campo_grupo': frame.get_by_label("Grupo"),
+                'campo_filial': frame.get_by_label("Filial"),
+                'campo_ambiente': frame.get_by_label("Ambiente"),
                 'popup_fechar': self.page.get_by_role("button", name="Fechar")
             }
         except Exception as e:
@@ -152,10 +231,11 @@ class ProtheusScraper(Utils):
     def _fechar_recursos(self):
         """Fecha todos os recursos de forma segura."""
         try:
-            time.sleep(self.settings.SHUTDOWN_DELAY)
+            # Os arquivos já foram salvos com save_as em cada relatório; não há o que aguardar
             if self.context:
                 self.context.close()
-            if self.browser:
+            # Navegador compartilhado via CDP continua aberto para a próxima execução
+            if self.browser and not self.via_cdp:
                 self.browser.close()
             if self.playwright:
                 self.playwright.stop()
@@ -171,13 +251,15 @@ class ProtheusScraper(Utils):
         """
         try:
             logger.info(f"Navegando para: Protheus")
-            self.page.goto(self.settings.BASE_URL)
+            # O combobox de ambiente é aguardado pelo select_option; basta o DOM carregado
+            self.page.goto(self.settings.BASE_URL, wait_until="domcontentloaded")
             self.page.get_by_role("group", name="Ambiente no servidor").get_by_role("combobox").select_option("CEOS62_PROD")
-            time.sleep(1)
-            # Clica no botão OK se estiver visível
-            if self.locators['botao_ok'].is_visible():
+            # Clica no botão OK se ele aparecer (nem sempre é exibido)
+            if self._aguardar_visivel('botao_ok', timeout=2000):
                 self.locators['botao_ok'].click()
                 logger.info("Botão 'Ok' clicado")
+            else:
+                logger.info("Botão 'Ok' não exibido, seguindo")
             
         except PlaywrightTimeoutError as e:
             error_msg = "Timeout ao navegar para a página do Protheus"
@@ -205,23 +287,32 @@ class ProtheusScraper(Utils):
             self.locators['campo_senha'].fill(self.settings.SENHA)
             self.locators['botao_entrar'].click()
             
-            # Preenche campos adicionais de configuração
-            input_campo_grupo = '01'
-            input_campo_filial = '0101'            
-            input_campo_ambiente = '34'
+            # Preenche campos adicionais de configuração: (locator, rótulo na tela, valor)
+            campos_configuracao = (
+                ('campo_grupo', 'Grupo', '01'),
+                ('campo_filial', 'Filial', '0101'),
+                ('campo_ambiente', 'Ambiente', '34'),
+            )
             self.locators['campo_grupo'].wait_for(state="visible", timeout=self.settings.TIMEOUT)
-            self.locators['campo_grupo'].click()
-            self.locators['campo_grupo'].fill(input_campo_grupo)
-            self.locators['campo_filial'].click()
-            self.locators['campo_filial'].fill(input_campo_filial)
-            self.locators['campo_ambiente'].click()
-            time.sleep(2)
-            self.locators['campo_ambiente'].fill(input_campo_ambiente)
-            time.sleep(2)
+            if self.settings.PREENCHIMENTO_VIA_SCRIPT:
+                self.locators['campo_ambiente'].wait_for(state="visible")
+                faltando = self.locators['corpo_login'].evaluate(
+                    _JS_PREENCHER_LOGIN,
+                    [[rotulo, valor] for _, rotulo, valor in campos_configuracao]
+                )
+            else:
+                # Padrão: campo a campo, na ordem da tela; cada click()/fill() só age
+                # quando o campo está habilitado, depois da validação do anterior
+                faltando = [rotulo for _, rotulo, _ in campos_configuracao]
+            # Campos não gravados pelo script são preenchidos pelo Playwright
+            for chave, rotulo, valor in campos_configuracao:
+                if rotulo in faltando:
+                    self.locators[chave].click()
+                    self.locators[chave].fill(valor)
+            # click() só dispara quando o botão está visível e habilitado, sem pausa fixa
             self.locators['botao_entrar'].click()
             
-            # Fecha popups se existirem
-            time.sleep(1)
+            # Popups pós-login são aguardados pelo próprio botão "Fechar"
             self._fechar_popup_se_existir()
             logger.info("Login realizado com sucesso")
             
@@ -247,65 +338,40 @@ class ProtheusScraper(Utils):
             # 0. Inicialização e login
             self.start_scraper()
             self.login()
-            results.append({
-                'status': 'success',
-                'message': 'Login realizado com sucesso',
-                'etapa': 'autenticação',
-                'error_code': None
-            })
+            results.append(_resultado('success', 'Login realizado com sucesso', 'autenticação'))
 
             # 1. Executar Financeiro
             try:       
-                financeiro = ExtracaoFinanceiro(self.page)
+                financeiro = ExtracaoFinanceiro(self.page, self.settings)
                 resultado_financeiro = financeiro.execucao()
                 resultado_financeiro['etapa'] = 'financeiro'
                 results.append(resultado_financeiro)
                 
             except Exception as e:
-                results.append({
-                    'status': 'error',
-                    'message': f'Falha no Financeiro: {str(e)}',
-                    'etapa': 'financeiro',
-                    'error_code': getattr(e, 'code', 'FE4') if hasattr(e, 'code') else 'FE3'
-                })
+                results.append(_resultado('error', f'Falha no Financeiro: {str(e)}', 'financeiro', _codigo_erro(e)))
 
             # 2. Executar Modelo_1
             try:
-                modelo_1 = Modelo_1(self.page)
+                modelo_1 = Modelo_1(self.page, self.settings)
                 resultado_modelo = modelo_1.execucao()
                 resultado_modelo['etapa'] = 'modelo_1'
                 results.append(resultado_modelo)
             except Exception as e:
-                results.append({
-                    'status': 'error',
-                    'message': f'Falha no Modelo_1: {str(e)}',
-                    'etapa': 'modelo_1',
-                    'error_code': getattr(e, 'code', 'FE4') if hasattr(e, 'code') else 'FE3'
-                })
+                results.append(_resultado('error', f'Falha no Modelo_1: {str(e)}', 'modelo_1', _codigo_erro(e)))
 
             # 3. Executar Contas x Itens
             try:
-                contasxitens = Contas_x_itens(self.page)
+                contasxitens = Contas_x_itens(self.page, self.settings)
                 resultado_contas = contasxitens.execucao()
                 results.append(resultado_contas)
             except Exception as e:
-                results.append({
-                    'status': 'error',
-                    'message': f'Falha em Contas x Itens: {str(e)}',
-                    'etapa': 'contas_x_itens',
-                    'error_code': getattr(e, 'code', 'FE4') if hasattr(e, 'code') else 'FE3'
-                })
+                results.append(_resultado('error', f'Falha em Contas x Itens: {str(e)}', 'contas_x_itens', _codigo_erro(e)))
                     
         except Exception as e:
             # Erro crítico não tratado no processo principal
             error_msg = f"Erro crítico não tratado: {str(e)}"
             logger.error(error_msg)
-            results.append({
-                'status': 'critical_error',
-                'message': error_msg,
-                'etapa': 'processo_principal',
-                'error_code': getattr(e, 'code', 'FE3') if hasattr(e, 'code') else 'FE3'
-            })
+            results.append(_resultado('critical_error', error_msg, 'processo_principal', _codigo_erro(e)))
 
         finally:
             # PROCESSAMENTO DO BANCO DE DADOS (EXECUTA MESMO COM ERROS ANTERIORES)
@@ -323,38 +389,34 @@ class ProtheusScraper(Utils):
                         ('adiantamento', 'ctbr100.xlsx', db.settings.TABLE_ADIANTAMENTO)
                     ]
                     
+                    # Arquivos presentes na pasta, lidos de uma vez (nomes sem diferenciar maiúsculas, como no Windows)
+                    try:
+                        with os.scandir(caminho_downloads) as entradas:
+                            presentes = {entrada.name.casefold() for entrada in entradas if entrada.is_file()}
+                    except FileNotFoundError:
+                        presentes = set()
+                    
                     # Importar cada arquivo
                     importacoes_realizadas = 0
                     for nome, arquivo, tabela in arquivos_importar:
                         try:
-                            file_path = caminho_downloads / arquivo
-                            
-                            if not file_path.exists():
+                            if arquivo.casefold() not in presentes:
                                 logger.warning(f"Arquivo {arquivo} não encontrado, pulando...")
                                 continue
+                            file_path = caminho_downloads / arquivo
                                 
                             logger.info(f"Importando {arquivo} para tabela {tabela}...")
                             success = db.import_from_excel(file_path, tabela)
                             
                             if success:
                                 importacoes_realizadas += 1
-                                results.append({
-                                    'status': 'success',
-                                    'message': f'Planilha {nome} importada com sucesso',
-                                    'etapa': 'importação',
-                                    'error_code': None
-                                })
+                                results.append(_resultado('success', f'Planilha {nome} importada com sucesso', 'importação'))
                                 logger.info(f"✅ {arquivo} importado para {tabela}")
                             else:
                                 raise Exception(f"Falha na importação do arquivo {arquivo}")
                                 
                         except Exception as e:
-                            results.append({
-                                'status': 'error',
-                                'message': f'Falha ao importar {nome}: {str(e)}',
-                                'etapa': 'importação',
-                                'error_code': getattr(e, 'code', 'FE3') if hasattr(e, 'code') else 'FE3'
-                            })
+                            results.append(_resultado('error', f'Falha ao importar {nome}: {str(e)}', 'importação', _codigo_erro(e)))
                             logger.error(f"❌ Erro ao importar {arquivo}: {e}")
 
                     # Processar dados apenas se pelo menos uma importação teve sucesso
@@ -367,65 +429,36 @@ class ProtheusScraper(Utils):
                             # Planilha de fornecedores
                             output_path_fornecedores = db.export_to_excel(export_type="fornecedores")
                             if output_path_fornecedores:
-                                results.append({
-                                    'status': 'success',
-                                    'message': f'Conciliação de fornecedores gerada em {output_path_fornecedores}',
-                                    'etapa': 'processamento',
-                                    'error_code': None
-                                })
+                                results.append(_resultado('success', f'Conciliação de fornecedores gerada em {output_path_fornecedores}', 'processamento'))
                                 logger.info(f"✅ Planilha de fornecedores gerada: {output_path_fornecedores}")
                             
                             # Planilha de adiantamentos
                             output_path_adiantamentos = db.export_to_excel(export_type="adiantamentos")
                             if output_path_adiantamentos:
-                                results.append({
-                                    'status': 'success',
-                                    'message': f'Conciliação de adiantamentos gerada em {output_path_adiantamentos}',
-                                    'etapa': 'processamento',
-                                    'error_code': None
-                                })
+                                results.append(_resultado('success', f'Conciliação de adiantamentos gerada em {output_path_adiantamentos}', 'processamento'))
                                 logger.info(f"✅ Planilha de adiantamentos gerada: {output_path_adiantamentos}")
                             
                             # Verificar se pelo menos uma planilha foi gerada
                             if output_path_fornecedores or output_path_adiantamentos:
                                 logger.info("✅ Todas as planilhas foram geradas com sucesso")
                             else:
-                                results.append({
-                                    'status': 'error',
-                                    'message': 'Falha ao gerar planilhas de conciliação',
-                                    'etapa': 'processamento',
-                                    'error_code': 'DB001'
-                                })
+                                results.append(_resultado('error', 'Falha ao gerar planilhas de conciliação', 'processamento', 'DB001'))
                         else:
-                            results.append({
-                                'status': 'error',
-                                'message': 'Falha no processamento dos dados',
-                                'etapa': 'processamento',
-                                'error_code': 'DB002'
-                            })
+                            results.append(_resultado('error', 'Falha no processamento dos dados', 'processamento', 'DB002'))
                     else:
-                        results.append({
-                            'status': 'error',
-                            'message': 'Nenhum arquivo foi importado com sucesso',
-                            'etapa': 'importação',
-                            'error_code': 'DB003'
-                        })
+                        results.append(_resultado('error', 'Nenhum arquivo foi importado com sucesso', 'importação', 'DB003'))
                         logger.error("❌ Nenhum arquivo importado, pulando processamento")
 
             except Exception as e:
                 # Falha crítica no processamento do banco
                 error_msg = f"Falha crítica no processamento do banco: {str(e)}"
                 logger.error(error_msg)
-                results.append({
-                    'status': 'critical_error',
-                    'message': error_msg,
-                    'etapa': 'database',
-                    'error_code': getattr(e, 'code', 'DB000') if hasattr(e, 'code') else 'DB000'
-                })
+                results.append(_resultado('critical_error', error_msg, 'database', _codigo_erro(e, 'DB000')))
 
             # Verificação final dos resultados
-            sucessos = sum(1 for r in results if r['status'] == 'success')
-            erros = sum(1 for r in results if r['status'] in ['error', 'critical_error'])
+            contagem = Counter(r['status'] for r in results)
+            sucessos = contagem['success']
+            erros = contagem['error'] + contagem['critical_error']
             
             if erros > 0:
                 logger.warning(f"Processo concluído com {sucessos} sucessos e {erros} erros")
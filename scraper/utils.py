@@ -4,23 +4,222 @@ Contém funções auxiliares para interação com páginas web, manipulação de
 e carregamento de parâmetros de configuração.
 """
 
-from playwright.sync_api import Page
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from config.logger import configure_logger
 from .exceptions import (
     ExcecaoNaoMapeadaError,
     FormSubmitFailed
 )
+from ._locator_registry import build as build_locators
 
-from datetime import datetime, date
+from datetime import date
+from functools import cached_property, lru_cache, wraps
 from pathlib import Path
-import time
+from types import CodeType, MappingProxyType
 import os
-import calendar
+import inspect
 import json
+import re
+import sys
+
+# Decodificador JSON em Rust (orjson); sem ele usa o json da biblioteca padrão
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # Configuração do logger para registro de atividades
 logger = configure_logger()
 
+
+class _InspectSemPilha:
+    """Repassa o módulo inspect, mas devolve uma pilha vazia em stack()."""
+
+    def __getattr__(self, nome):
+        return getattr(inspect, nome)
+
+    @staticmethod
+    def stack(*args, **kwargs):
+        return []
+
+
+def _chama_inspect_stack(codigo):
+    """
+    Indica se o código (ou uma função aninhada nele) chama inspect.stack().
+    
+    Args:
+        codigo (CodeType): Objeto de código de uma função
+        
+    Returns:
+        bool: True se 'inspect' e 'stack' aparecem entre os nomes usados pelo código
+    """
+    if 'inspect' in codigo.co_names and 'stack' in codigo.co_names:
+        return True
+    return any(_chama_inspect_stack(c) for c in codigo.co_consts if isinstance(c, CodeType))
+
+def _modulo_chama_inspect_stack(modulo):
+    """
+    Indica se alguma função ou método definido no módulo chama inspect.stack().
+    
+    Args:
+        modulo: Módulo interno do Playwright
+        
+    Returns:
+        bool: True se o módulo faz a captura de pilha com inspect.stack()
+    """
+    for objeto in vars(modulo).values():
+        if inspect.isclass(objeto) and objeto.__module__ == modulo.__name__:
+            funcoes = vars(objeto).values()
+        else:
+            funcoes = (objeto,)
+        for funcao in funcoes:
+            if inspect.isfunction(funcao) and _chama_inspect_stack(funcao.__code__):
+                return True
+    return False
+
+
+# O Playwright 1.42 (versão do requirements) chama inspect.stack() a cada comando, na camada
+# síncrona (_sync_base) e na conexão (_connection), para montar o rastro exibido em erros e
+# traces; isso custa uma fração grande de CPU em loops de cliques. Com PW_INSPECT_STACK=0 essa
+# captura é desligada nos módulos que a fazem (erros perdem a linha do script e o nome da chamada).
+# Versões mais novas capturam a pilha por inspect.currentframe(), mais leve, e não são alteradas.
+if os.environ.get("PW_INSPECT_STACK") == "0":
+    try:
+        from playwright._impl import _connection as _pw_connection, _sync_base as _pw_sync_base
+        alterados = [
+            modulo.__name__ for modulo in (_pw_sync_base, _pw_connection)
+            if getattr(modulo, 'inspect', None) is inspect and _modulo_chama_inspect_stack(modulo)
+        ]
+        for nome in alterados:
+            sys.modules[nome].inspect = _InspectSemPilha()
+        if alterados:
+            logger.info(f"Captura de pilha do Playwright desativada em {', '.join(alterados)} (PW_INSPECT_STACK=0)")
+        else:
+            logger.info("PW_INSPECT_STACK=0 ignorado: esta versão do Playwright não usa inspect.stack()")
+    except (ImportError, AttributeError) as e:
+        logger.warning(f"Não foi possível desativar a captura de pilha do Playwright: {e}")
+
+# Preenche vários campos de uma vez no navegador. Cada item é [seletor do componente, valor];
+# o input pode estar no próprio componente ou no shadow DOM dele. Retorna os seletores não encontrados.
+_JS_PREENCHER_CAMPOS = """(campos) => {
+    const faltando = [];
+    for (const [seletor, valor] of campos) {
+        const host = document.querySelector(seletor);
+        const campo = host && (host.querySelector('input')
+            || (host.shadowRoot && host.shadowRoot.querySelector('input')));
+        if (!campo) {
+            faltando.push(seletor);
+            continue;
+        }
+        campo.focus();
+        campo.value = valor;
+        campo.dispatchEvent(new Event('input', {bubbles: true}));
+        campo.dispatchEvent(new Event('change', {bubbles: true}));
+        campo.blur();
+    }
+    return faltando;
+}"""
+
+# Placeholders aceitos no parameters.json e o método de Utils que resolve cada um (somente leitura)
+_RESOLVEDORES = MappingProxyType({
+    'primeiro_e_ultimo_dia': 'primeiro_e_ultimo_dia',
+    'obter_ultimo_dia_ano_passado': 'obter_ultimo_dia_ano_passado',
+    'data_atual': '_get_data_atual',
+    'datas_contas_itens': 'datas_contas_itens',
+    'data_futura': 'data_futura',
+    'ultimo_dia_mes_anterior': 'ultimo_dia_mes_anterior',
+})
+
+# Placeholder do parameters.json: {{metodo}} ou {{metodo.parte}}, com espaços opcionais
+_PLACEHOLDER_RE = re.compile(r'^\{\{\s*(\w+)\s*(?:\.\s*(\w+)\s*)?\}\}$')
+
+# Dias de cada mês em ano não bissexto
+_DIAS_NO_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _ultimo_dia(ano, mes):
+    """
+    Retorna o último dia do mês (equivalente a calendar.monthrange(ano, mes)[1]).
+    
+    Args:
+        ano (int): Ano
+        mes (int): Mês (1 a 12)
+        
+    Returns:
+        int: Número de dias do mês
+    """
+    if mes == 2 and ano % 4 == 0 and (ano % 100 != 0 or ano % 400 == 0):
+        return 29
+    return _DIAS_NO_MES[mes - 1]
+
+@lru_cache(maxsize=256)
+def _fim_mes_anterior(ano, mes):
+    """
+    Retorna o último dia do mês anterior ao mês informado (vale também na virada de ano).
+    
+    Args:
+        ano (int): Ano de referência
+        mes (int): Mês de referência (1 a 12)
+        
+    Returns:
+        tuple: (dia, mes, ano) do último dia do mês anterior
+    """
+    mes_anterior = 12 if mes == 1 else mes - 1
+    ano_anterior = ano - 1 if mes == 1 else ano
+    return _ultimo_dia(ano_anterior, mes_anterior), mes_anterior, ano_anterior
+
+def _formatar_data(dia, mes, ano):
+    """
+    Formata uma data como DD/MM/AAAA direto dos números, sem montar um objeto date.
+    
+    Args:
+        dia (int): Dia
+        mes (int): Mês
+        ano (int): Ano
+        
+    Returns:
+        str: Data no formato DD/MM/AAAA
+    """
+    return f"{dia:02d}/{mes:02d}/{ano:04d}"
+
+@lru_cache(maxsize=16)
+def _ler_json(caminho, mtime_ns):
+    """
+    Lê e decodifica um arquivo JSON, mantendo o resultado em cache.
+    
+    A data de modificação faz parte da chave do cache: se o arquivo for editado,
+    a próxima leitura vai ao disco novamente. O dicionário retornado é compartilhado
+    entre as chamadas e não deve ser alterado.
+    
+    Args:
+        caminho (str): Caminho do arquivo JSON
+        mtime_ns (int): Data de modificação do arquivo (st_mtime_ns)
+        
+    Returns:
+        dict: Conteúdo do arquivo
+    """
+    return _json_loads(Path(caminho).read_bytes())
+
+def registrar_falha(descricao):
+    """
+    Decorador para etapas que apenas registram a falha no log e a repassam adiante.
+
+    Substitui o bloco try/except repetido em cada método; a exceção original é
+    relançada sem alteração, para que o chamador continue vendo o mesmo tipo e mensagem.
+
+    Args:
+        descricao (str): Texto registrado no log antes da mensagem da exceção
+    """
+    def decorador(metodo):
+        @wraps(metodo)
+        def envolvido(self, *args, **kwargs):
+            try:
+                return metodo(self, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"{descricao}: {e}")
+                raise
+        return envolvido
+    return decorador
+
 class Utils:
     """Classe utilitária com métodos para auxiliar na automação de tarefas web."""
     
@@ -32,30 +231,161 @@ class Utils:
             page (Page): Instância da página do Playwright
         """
         self.page = page
-        self._definir_locators()
     
-    def _definir_locators(self):
+    @cached_property
+    def locators(self):
         """
         Centraliza a definição de todos os locators usados na automação.
-        Os locators são armazenados como variáveis de instância para reutilização.
+        Criados apenas no primeiro acesso e reaproveitados depois; as classes
+        de relatório atribuem self.locators no próprio _definir_locators.
+        
+        Returns:
+            dict: Locators base indexados pelo nome
         """
-        self.locators = {
-            'popup_fechar': self.page.get_by_role("button", name="Fechar"),
-            'botao_confirmar': self.page.get_by_role("button", name="Confirmar"), 
-            'botao_marcar_filiais': self.page.get_by_role("button", name="Marca Todos - <F4>")
-        }
+        return build_locators(self.page)
     
-    def _fechar_popup_se_existir(self):
+    def _clicar(self, chave, **kwargs):
+        """
+        Clica no locator indicado pelo nome.
+        
+        Args:
+            chave (str): Nome do locator em self.locators
+            **kwargs: Argumentos repassados ao click() do Playwright
+        """
+        self.locators[chave].click(**kwargs)
+    
+    def _salvar_download(self, download, destino):
+        """
+        Aguarda o término do download capturado por expect_download e salva o arquivo.
+        
+        Args:
+            download: Objeto de download do Playwright (download_info.value)
+            destino (Path): Caminho final do arquivo
+            
+        Returns:
+            str | None: Motivo da falha do download, ou None se o arquivo foi salvo
+        """
+        logger.info(f"Download iniciado: {download.suggested_filename}")
+        # failure() aguarda a conclusão e retorna None quando terminou sem erro
+        falha = download.failure()
+        if falha is None:
+            download.save_as(destino)
+        return falha
+    
+    def _aguardar_visivel(self, chave, timeout=10000):
+        """
+        Aguarda um elemento opcional ficar visível, sem tratar a ausência como erro.
+        
+        A espera é sempre pelo próprio elemento; não use page.goto/wait_for_load_state
+        com "networkidle", que só libera após a rede ficar ociosa.
+        
+        Args:
+            chave (str): Nome do locator em self.locators
+            timeout (int): Espera máxima em milissegundos
+            
+        Returns:
+            bool: True se o elemento apareceu no prazo, False caso contrário
+        """
+        try:
+            self.locators[chave].wait_for(state="visible", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+    
+    def _aguardar_ou_repetir(self, chave_alvo, chave_gatilho, timeout=3000):
+        """
+        Aguarda o elemento aberto por um clique; se ele não aparecer a tempo,
+        clica novamente no gatilho (menu que não abriu) e aguarda outra vez.
+        
+        Args:
+            chave_alvo (str): Locator que deve ficar visível
+            chave_gatilho (str): Locator clicado novamente em caso de falha
+            timeout (int): Espera inicial em milissegundos antes de repetir o clique
+            
+        Raises:
+            PlaywrightTimeoutError: Se o alvo não aparecer nem após repetir o clique
+                (a segunda espera usa o timeout padrão da página)
+        """
+        try:
+            self.locators[chave_alvo].wait_for(state="visible", timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.info(f"'{chave_alvo}' não apareceu, clicando novamente em '{chave_gatilho}'")
+            self._clicar(chave_gatilho)
+            self.locators[chave_alvo].wait_for(state="visible")
+    
+    def _preencher_campo(self, chave, valor, timeout=5000):
+        """
+        Preenche um campo de texto pelo Playwright, ignorando valores ausentes.
+        
+        Apenas None é ignorado: uma string vazia ainda é gravada, pois o Protheus
+        guarda os últimos parâmetros usados e o campo precisa ser limpo.
+        
+        Args:
+            chave (str): Nome do locator em self.locators
+            valor: Valor a ser preenchido
+            timeout (int): Espera máxima em milissegundos pelo campo
+        """
+        if valor is None:
+            return
+        campo = self.locators[chave]
+        campo.wait_for(state="visible", timeout=timeout)
+        # fill() já foca, limpa e grava o valor; um click() antes só dobraria a ida ao navegador
+        campo.fill(valor)
+    
+    def _preencher_campos(self, campos):
+        """
+        Preenche vários campos de texto, campo a campo pelo fill() do Playwright.
+        
+        Com PREENCHIMENTO_VIA_SCRIPT ativo nas configurações, os valores são gravados
+        com uma única chamada ao navegador; os campos que não forem encontrados pelo
+        script (ou todos, se a chamada falhar) são preenchidos campo a campo.
+        Campos sem valor (None) são ignorados.
+        
+        Args:
+            campos (list): Tuplas (chave do locator, seletor do componente, valor)
+        """
+        campos = [campo for campo in campos if campo[2] is not None]
+        if not campos:
+            return
+        
+        if not getattr(getattr(self, 'settings', None), 'PREENCHIMENTO_VIA_SCRIPT', False):
+            for chave, _, valor in campos:
+                self._preencher_campo(chave, valor)
+            return
+        
+        try:
+            faltando = set(self.page.evaluate(
+                _JS_PREENCHER_CAMPOS, [[seletor, valor] for _, seletor, valor in campos]
+            ))
+        except Exception as e:
+            logger.warning(f"Preenchimento em lote indisponível, preenchendo campo a campo: {e}")
+            faltando = {seletor for _, seletor, _ in campos}
+        
+        for chave, seletor, valor in campos:
+            if seletor in faltando:
+                self._preencher_campo(chave, valor)
+    
+    def _fechar_popup_se_existir(self, timeout=5000, timeout_seguinte=2000, max_popups=5):
         """
         Tenta fechar popups que possam aparecer durante a execução.
         
-        Este método verifica se um popup com botão "Fechar" está visível
-        e tenta fechá-lo. Se não encontrar o popup, apenas registra um aviso.
+        O Protheus pode empilhar mais de um popup com botão "Fechar"; eles são
+        fechados um a um até que nenhum outro apareça no prazo. Falhas ao
+        verificar o popup apenas registram um aviso.
+        
+        Args:
+            timeout (int): Espera pelo primeiro popup em milissegundos
+            timeout_seguinte (int): Espera pelos popups seguintes em milissegundos
+            max_popups (int): Quantidade máxima de popups fechados em uma chamada
         """
         try:
-            time.sleep(5)  # Aguarda possível aparecimento do popup
-            if self.locators['popup_fechar'].is_visible():
-                self.locators['popup_fechar'].click()
+            fechados = 0
+            # Aguarda o possível aparecimento de cada popup; sem popup no prazo, segue
+            while fechados < max_popups and self._aguardar_visivel(
+                'popup_fechar', timeout=timeout if fechados == 0 else timeout_seguinte
+            ):
+                self._clicar('popup_fechar')
+                fechados += 1
                 logger.info("Popup fechado")
         except Exception as e:
             logger.warning(f"Erro ao verificar popup: {e}")
@@ -64,16 +394,16 @@ class Utils:
         """
         Confirma uma operação clicando no botão "Confirmar".
         
-        Após a confirmação, verifica se há popups para fechar.
+        Popups exibidos após a confirmação ficam a cargo de quem chama,
+        com _fechar_popup_se_existir (que fecha todos os popups empilhados).
         
         Raises:
             FormSubmitFailed: Se não conseguir confirmar a operação
         """
         try:
-            time.sleep(5)  # Aguarda carregamento do botão
-            self.locators['botao_confirmar'].click()
+            # click() aguarda o botão ficar visível e habilitado até o timeout padrão da página
+            self._clicar('botao_confirmar')
             logger.info("Operação confirmada")
-            self._fechar_popup_se_existir()  # Fecha possíveis popups pós-confirmação
         except Exception as e:
             error_msg = "Falha na confirmação da operação"
             logger.error(f"{error_msg}: {e}")
@@ -89,12 +419,15 @@ class Utils:
             FormSubmitFailed: Se não conseguir selecionar as filiais
         """
         try: 
-            time.sleep(3)  # Aguarda carregamento do botão
-            if self.locators['botao_marcar_filiais'].is_visible():
-                self.locators['botao_marcar_filiais'].click()
-                time.sleep(1)  # Pequena pausa após seleção
-                self.locators['botao_confirmar'].click()  # Confirma a seleção
-                logger.info("Filial selecionada")
+            # A janela de filiais nem sempre é exibida; sem o botão no prazo, segue
+            if not self._aguardar_visivel('botao_marcar_filiais', timeout=3000):
+                return
+            self._clicar('botao_marcar_filiais')
+            # O 'Confirmar' já está visível na mesma janela; a pausa dá tempo de a grade
+            # aplicar as marcações antes da confirmação (não há sinal na tela para aguardar)
+            self.page.wait_for_timeout(1000)
+            self._clicar('botao_confirmar')  # Confirma a seleção
+            logger.info("Filial selecionada")
         except Exception as e:
             error_msg = "Falha na seleção de filiais"
             logger.error(f"{error_msg}: {e}")
@@ -106,58 +439,47 @@ class Utils:
         conforme as regras especificadas.
         
         Args:
-            data_referencia (datetime, optional): Data de referência para cálculo.
+            data_referencia (date, optional): Data de referência para cálculo (datetime também é aceito).
                 Se None, usa a data atual.
         
         Returns:
             tuple: (data_inicial, data_final) no formato DD/MM/YYYY
         """
         if data_referencia is None:
-            data_referencia = datetime.now()
+            data_referencia = date.today()
         
         dia = data_referencia.day
         mes = data_referencia.month
         ano = data_referencia.year
         
         # Verifica se é o último dia do mês
-        ultimo_dia_mes = calendar.monthrange(ano, mes)[1]
+        ultimo_dia_mes = _ultimo_dia(ano, mes)
         eh_ultimo_dia = dia == ultimo_dia_mes
         
         if eh_ultimo_dia:
-            # Regra para último dia do mês
-            # Data Inicial: primeiro dia do mês anterior
-            if mes == 1:
-                data_inicial = datetime(ano - 1, 12, 1)
-            else:
-                data_inicial = datetime(ano, mes - 1, 1)
-            
+            # Regra para último dia do mês: o período é o mês anterior inteiro
             # Data Final: último dia do mês anterior
-            if mes == 1:
-                ultimo_dia_anterior = calendar.monthrange(ano - 1, 12)[1]
-                data_final = datetime(ano - 1, 12, ultimo_dia_anterior)
-            else:
-                ultimo_dia_anterior = calendar.monthrange(ano, mes - 1)[1]
-                data_final = datetime(ano, mes - 1, ultimo_dia_anterior)
+            data_final = _fim_mes_anterior(ano, mes)
+            
+            # Data Inicial: primeiro dia do mês anterior
+            data_inicial = (1, *data_final[1:])
         
         # elif dia == 20:
         #     # Regra para dia 20
         #     # Data Inicial: primeiro dia do mês atual
-        #     data_inicial = datetime(ano, mes, 1)
+        #     data_inicial = (1, mes, ano)
             
         #     # Data Final: dia 20 do mês atual
-        #     data_final = datetime(ano, mes, 20)
+        #     data_final = (20, mes, ano)
         
         # else:
         #     # Para outros dias, use as regras padrão ou defina um comportamento alternativo
         #     # Aqui estou usando o mesmo comportamento do dia 20 como padrão
-        #     data_inicial = datetime(ano, mes, 1)
-        #     data_final = datetime(ano, mes, min(dia, 20))  # Usa o menor entre o dia atual e 20
+        #     data_inicial = (1, mes, ano)
+        #     data_final = (min(dia, 20), mes, ano)  # Usa o menor entre o dia atual e 20
         
-        # Formata as datas para o padrão DD/MM/YYYY
-        data_inicial_str = data_inicial.strftime('%d/%m/%Y')
-        data_final_str = data_final.strftime('%d/%m/%Y')
-        
-        return data_inicial_str, data_final_str
+        # Formata as datas (dia, mês, ano) para o padrão DD/MM/YYYY
+        return _formatar_data(*data_inicial), _formatar_data(*data_final)
     
     def datas_contas_itens(self):
         """
@@ -176,23 +498,10 @@ class Utils:
         Returns:
             str: Último dia do mês anterior no formato DD/MM/YYYY
         """
-        hoje = datetime.now()
-        
-        # Calcula mês e ano anterior
-        if hoje.month == 1:
-            mes_anterior = 12
-            ano_anterior = hoje.year - 1
-        else:
-            mes_anterior = hoje.month - 1
-            ano_anterior = hoje.year
-        
-        # Obtém o último dia do mês anterior
-        ultimo_dia = calendar.monthrange(ano_anterior, mes_anterior)[1]
-        data_ultimo_dia = datetime(ano_anterior, mes_anterior, ultimo_dia)
-        
-        return data_ultimo_dia.strftime('%d/%m/%Y')
+        hoje = date.today()
+        return _formatar_data(*_fim_mes_anterior(hoje.year, hoje.month))
     
-    def _resolver_valor(self, valor):
+    def _resolver_valor(self, valor, resolvidos=None):
         """
         Resolve valores que contenham placeholders {{}} chamando funções correspondentes.
         
@@ -201,35 +510,34 @@ class Utils:
         
         Args:
             valor: Valor a ser resolvido (pode ser string com placeholder ou valor estático)
+            resolvidos (dict, optional): Resultados já calculados por método, compartilhados
+                entre as chamadas de um mesmo carregamento de parâmetros
             
         Returns:
             Valor resolvido (pode ser string, tupla ou qualquer tipo retornado pela função)
         """
-        # Verifica se o valor é uma string com placeholder
-        if isinstance(valor, str) and valor.startswith('{{') and valor.endswith('}}'):
-            placeholder = valor[2:-2].strip()
-            
-            # Verifica se há especificação de parte da tupla (ex: .inicial ou .final)
-            if '.' in placeholder:
-                nome_metodo, parte = placeholder.split('.', 1)
-                parte = parte.strip()
-            else:
-                nome_metodo = placeholder
-                parte = None
-            
-            # Mapeamento de métodos disponíveis para resolução
-            metodos_disponiveis = {
-                'primeiro_e_ultimo_dia': self.primeiro_e_ultimo_dia,
-                'obter_ultimo_dia_ano_passado': self.obter_ultimo_dia_ano_passado,
-                'data_atual': self._get_data_atual,
-                'datas_contas_itens': self.datas_contas_itens,
-                'data_futura': self.data_futura,
-                'ultimo_dia_mes_anterior': self.ultimo_dia_mes_anterior
-            }
+        # Descarta logo valores que não sejam string ou não comecem com {{ e terminem com }},
+        # sem passar pela regex (a maioria dos parâmetros é estática)
+        if not (isinstance(valor, str) and len(valor) >= 4
+                and valor[0] == '{' and valor[1] == '{'
+                and valor[-1] == '}' and valor[-2] == '}'):
+            return valor
+        
+        # Verifica se o valor é um placeholder válido; a parte da tupla
+        # (ex: .inicial ou .final) vem no segundo grupo, ou None se ausente
+        correspondencia = _PLACEHOLDER_RE.match(valor)
+        if correspondencia:
+            nome_metodo, parte = correspondencia.groups()
             
             # Verifica se o método solicitado está disponível
-            if nome_metodo in metodos_disponiveis:
-                resultado = metodos_disponiveis[nome_metodo]()
+            metodo = _RESOLVEDORES.get(nome_metodo)
+            if metodo is not None:
+                # Cada método roda uma vez por carregamento, mesmo usado por vários parâmetros
+                if resolvidos is None:
+                    resolvidos = {}
+                if nome_metodo not in resolvidos:
+                    resolvidos[nome_metodo] = getattr(self, metodo)()
+                resultado = resolvidos[nome_metodo]
                 
                 # Trata retornos em tupla com especificação de parte
                 if isinstance(resultado, tuple) and parte:
@@ -266,8 +574,8 @@ class Utils:
         try:
             caminho_arquivo = Path(__file__).parent.parent / 'config' / arquivo_json
             
-            with open(caminho_arquivo, 'r', encoding='utf-8') as file:
-                dados = json.load(file)
+            # Cada relatório lê o mesmo arquivo; só relê do disco se ele mudou
+            dados = _ler_json(str(caminho_arquivo), caminho_arquivo.stat().st_mtime_ns)
             
             # Verifica se a chave existe no JSON
             if chave not in dados:
@@ -275,8 +583,9 @@ class Utils:
             
             # Carrega os parâmetros e resolve placeholders
             self.parametros = {}
+            resolvidos = {}
             for param, valor in dados[chave].items():
-                self.parametros[param] = self._resolver_valor(valor)
+                self.parametros[param] = self._resolver_valor(valor, resolvidos)
             
             logger.info(f"Parâmetros carregados para chave '{chave}'")
             
@@ -301,7 +610,8 @@ class Utils:
         Returns:
             str: Data atual formatada
         """
-        return date.today().strftime('%d/%m/%Y')
+        hoje = date.today()
+        return _formatar_data(hoje.day, hoje.month, hoje.year)
     
     def primeiro_e_ultimo_dia(self):
         """
@@ -311,12 +621,10 @@ class Utils:
             tuple: (primeiro_dia, ultimo_dia) no formato DD/MM/YYYY
         """
         hoje = date.today()
-        primeiro_dia = date(hoje.year, hoje.month, 1)
-        ultimo_dia = date(hoje.year, hoje.month, calendar.monthrange(hoje.year, hoje.month)[1])
         
         return (
-            primeiro_dia.strftime('%d/%m/%Y'),
-            ultimo_dia.strftime('%d/%m/%Y')
+            _formatar_data(1, hoje.month, hoje.year),
+            _formatar_data(_ultimo_dia(hoje.year, hoje.month), hoje.month, hoje.year)
         )
     
     def obter_ultimo_dia_ano_passado(self):
@@ -327,8 +635,7 @@ class Utils:
             str: Último dia do ano anterior no formato DD/MM/YYYY
         """
         ano_passado = date.today().year - 1
-        ultimo_dia = date(ano_passado, 12, 31)
-        return ultimo_dia.strftime('%d/%m/%Y')
+        return _formatar_data(31, 12, ano_passado)
     
     def data_futura(self):
         """
@@ -337,9 +644,8 @@ class Utils:
         Returns:
             str: Data contábil futura no formato DD/MM/YYYY
         """
-        hoje = datetime.today()
-        ano_futuro = hoje.year + 25
-        return f"31/12/{ano_futuro}"
+        ano_futuro = date.today().year + 25
+        return _formatar_data(31, 12, ano_futuro)
     
     def _validar_parametros(self, parametros_obrigatorios: list):
         """
@@ -349,10 +655,10 @@ class Utils:
             parametros_obrigatorios (list): Lista de nomes de parâmetros obrigatórios
             
         Raises:
-            ValueError: Se algum parâmetro obrigatório estiver faltando
+            ValueError: Se algum parâmetro obrigatório estiver faltando (todos são listados)
         """
-        for param in parametros_obrigatorios:
-            if param not in self.parametros:
-                raise ValueError(f"Parâmetro obrigatório '{param}' não encontrado")
+        faltando = set(parametros_obrigatorios) - self.parametros.keys()
+        if faltando:
+            raise ValueError(f"Parâmetros obrigatórios não encontrados: {sorted(faltando)}")
         
         logger.info("Todos os parâmetros obrigatórios validados com sucesso")
\ No newline at end of file